@@ -5,26 +5,24 @@ BASTION API Models
 Pydantic models for request/response validation.
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Optional, Dict, Any, Literal
+from datetime import datetime, timezone
 
 
-class CalculateRiskRequest(BaseModel):
-    """Request model for /calculate endpoint."""
+class TradeBaseRequest(BaseModel):
+    """Shared fields for trade-scoped requests.
+    
+    Keeping these on one parent lets pydantic-core build the shared
+    field schemas and validators once instead of per request model.
+    """
     
     symbol: str = Field(
         default="BTCUSDT",
         description="Trading pair symbol (e.g., BTCUSDT, ETHUSDT)"
     )
-    entry_price: float = Field(
-        ...,
-        gt=0,
-        description="Entry price for the trade"
-    )
-    direction: str = Field(
+    direction: Literal["long", "short"] = Field(
         ...,
-        pattern="^(long|short)$",
         description="Trade direction: 'long' or 'short'"
     )
     timeframe: str = Field(
@@ -36,6 +34,20 @@ class CalculateRiskRequest(BaseModel):
         gt=0,
         description="Account balance in USD"
     )
+
+
+class CalculateRiskRequest(TradeBaseRequest):
+    """Request model for /calculate endpoint."""
+    
+    entry_price: float = Field(
+        ...,
+        gt=0,
+        description="Entry price for the trade"
+    )
+    timeframe: Literal["1m", "5m", "15m", "1h", "4h", "1d"] = Field(
+        default="4h",
+        description="Candle timeframe: 1m, 5m, 15m, 1h, 4h, 1d"
+    )
     risk_per_trade_pct: float = Field(
         default=1.0,
         gt=0,
@@ -43,8 +55,9 @@ class CalculateRiskRequest(BaseModel):
         description="Risk percentage per trade (0.1 - 10%)"
     )
     
-    model_config = {
-        "json_schema_extra": {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "symbol": "BTCUSDT",
                 "entry_price": 95000,
@@ -54,7 +67,7 @@ class CalculateRiskRequest(BaseModel):
                 "risk_per_trade_pct": 1.0
             }
         }
-    }
+    )
 
 
 class StopLevelResponse(BaseModel):
@@ -65,6 +78,8 @@ class StopLevelResponse(BaseModel):
     distance_pct: float = Field(description="Distance from entry as percentage")
     reason: str = Field(description="Reason for this stop level")
     confidence: float = Field(description="Confidence score (0-1)")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class TargetLevelResponse(BaseModel):
@@ -76,6 +91,8 @@ class TargetLevelResponse(BaseModel):
     distance_pct: float = Field(description="Distance from entry as percentage")
     reason: str = Field(description="Reason for this target")
     confidence: float = Field(description="Confidence score (0-1)")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class MarketContextResponse(BaseModel):
@@ -97,6 +114,8 @@ class MarketContextResponse(BaseModel):
         default=0.0,
         description="Multi-timeframe alignment (0-1)"
     )
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class RiskLevelsResponse(BaseModel):
@@ -127,10 +146,11 @@ class RiskLevelsResponse(BaseModel):
         description="Market context scores (informational only)"
     )
     
-    calculated_at: datetime = Field(default_factory=datetime.utcnow)
+    calculated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
-    model_config = {
-        "json_schema_extra": {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "symbol": "BTCUSDT",
                 "entry_price": 95000,
@@ -173,7 +193,12 @@ class RiskLevelsResponse(BaseModel):
                 }
             }
         }
-    }
+    )
+
+
+# Pre-built serializer for the hot /calculate path - building it once at
+# import time avoids per-call schema lookups and returns JSON bytes directly
+RISK_LEVELS_ADAPTER = TypeAdapter(RiskLevelsResponse)
 
 
 class ErrorResponse(BaseModel):
@@ -181,7 +206,9 @@ class ErrorResponse(BaseModel):
     
     error: str = Field(description="Error message")
     detail: Optional[str] = Field(default=None, description="Detailed error information")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class HealthResponse(BaseModel):
@@ -190,4 +217,6 @@ class HealthResponse(BaseModel):
     status: str = Field(default="ok")
     service: str = Field(default="BASTION")
     version: str = Field(default="2.0.0")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    
+    model_config = ConfigDict(frozen=True)
@@ -9,12 +9,19 @@ Endpoints:
     POST /calculate - Calculate risk levels for a trade
 """
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import List
+import asyncio
+import orjson
+import os
 import sys
+import time
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -26,9 +33,7 @@ from api.models import (
     RiskLevelsResponse,
     ErrorResponse,
     HealthResponse,
-    StopLevelResponse,
-    TargetLevelResponse,
-    MarketContextResponse
+    RISK_LEVELS_ADAPTER
 )
 from api import session_routes
 from core.risk_engine import RiskEngine
@@ -41,34 +46,23 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global instances
-risk_engine: RiskEngine = None
-data_fetcher: LiveDataFetcher = None
-session_manager: SessionManager = None
-live_feed: LiveFeed = None
-session_updater: SessionAutoUpdater = None
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manage application lifespan."""
-    global risk_engine, data_fetcher, session_manager, live_feed, session_updater
-    
+    """Create shared resources on app.state at startup, release on shutdown."""
     # Startup
     logger.info("BASTION API starting up...")
-    risk_engine = RiskEngine()
-    data_fetcher = LiveDataFetcher()
-    session_manager = SessionManager()
-    live_feed = LiveFeed(poll_interval=2.0, bar_check_interval=10.0)
-    session_updater = SessionAutoUpdater(live_feed, session_manager)
-    
-    # Wire session manager to routes
-    session_routes.session_manager = session_manager
-    session_routes.live_feed = live_feed
+    app.state.risk_engine = RiskEngine()
+    app.state.data_fetcher = LiveDataFetcher()
+    app.state.session_manager = SessionManager()
+    app.state.live_feed = LiveFeed(poll_interval=2.0, bar_check_interval=10.0)
+    app.state.session_updater = SessionAutoUpdater(
+        app.state.live_feed, app.state.session_manager
+    )
     
     # Start live feed
-    await live_feed.start()
-    await session_updater.start()
+    await app.state.live_feed.start()
+    await app.state.session_updater.start()
     
     logger.info("Risk engine initialized (Advanced Mode)")
     logger.info("Session manager initialized (Multi-Shot + Guarding)")
@@ -79,9 +73,19 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("BASTION API shutting down...")
-    await live_feed.stop()
-    await data_fetcher.close()
-    await risk_engine.close()
+    await app.state.live_feed.stop()
+    await app.state.data_fetcher.close()
+    await app.state.risk_engine.close()
+
+
+class BastionJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also handles numpy scalars and non-str dict keys."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
 
 
 # Initialize FastAPI with lifespan
@@ -91,16 +95,44 @@ app = FastAPI(
     version="2.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=BastionJSONResponse
 )
 
 # Include session routes
 app.include_router(session_routes.router)
 
-# CORS Middleware
+# Compress list-heavy payloads (stops/targets arrays, session lists);
+# small responses pass through untouched
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+class PathExemptCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that skips CORS processing entirely for exempt paths.
+
+    Liveness probes hit /health at a steady rate and never need CORS
+    headers, so they bypass the origin checks altogether.
+    """
+
+    EXEMPT_PATHS = frozenset({"/health"})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# CORS Middleware - origins configurable per deployment; the bundled /app
+# UI is same-origin and needs no CORS at all
+cors_origins = [
+    o.strip() for o in os.getenv(
+        "BASTION_CORS_ORIGINS",
+        "http://localhost:3000,http://localhost:8001,http://127.0.0.1:8001"
+    ).split(",") if o.strip()
+]
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
+    PathExemptCORSMiddleware,
+    allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -121,8 +153,10 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 
 @app.get("/", include_in_schema=False)
-async def root():
+async def root(request: Request):
     """Root endpoint."""
+    session_manager = getattr(request.app.state, "session_manager", None)
+    live_feed = getattr(request.app.state, "live_feed", None)
     active_sessions = len(session_manager.get_active_sessions()) if session_manager else 0
     feed_status = live_feed.status.value if live_feed else "disconnected"
     subscribed = live_feed.subscribed_symbols if live_feed else []
@@ -148,8 +182,9 @@ async def root():
 
 
 @app.get("/price/{symbol}", tags=["Live Data"])
-async def get_live_price(symbol: str = "BTCUSDT"):
+async def get_live_price(request: Request, symbol: str = "BTCUSDT"):
     """Get current live price for a symbol."""
+    live_feed = getattr(request.app.state, "live_feed", None)
     if not live_feed:
         raise HTTPException(status_code=503, detail="Live feed not available")
     
@@ -169,8 +204,9 @@ async def get_live_price(symbol: str = "BTCUSDT"):
 
 
 @app.get("/bars/{symbol}", tags=["Live Data"])
-async def get_bars(symbol: str = "BTCUSDT", timeframe: str = "4h", limit: int = 100):
+async def get_bars(request: Request, symbol: str = "BTCUSDT", timeframe: str = "4h", limit: int = 100):
     """Get OHLCV bars for a symbol."""
+    live_feed = getattr(request.app.state, "live_feed", None)
     if not live_feed:
         raise HTTPException(status_code=503, detail="Live feed not available")
     
@@ -198,8 +234,9 @@ async def get_bars(symbol: str = "BTCUSDT", timeframe: str = "4h", limit: int =
 
 
 @app.get("/orderflow/{symbol}", tags=["Live Data"])
-async def get_orderflow(symbol: str = "BTCUSDT"):
+async def get_orderflow(request: Request, symbol: str = "BTCUSDT"):
     """Get order flow data from Helsinki Quant."""
+    live_feed = getattr(request.app.state, "live_feed", None)
     if not live_feed:
         raise HTTPException(status_code=503, detail="Live feed not available")
     
@@ -220,18 +257,130 @@ async def get_orderflow(symbol: str = "BTCUSDT"):
     }
 
 
-@app.get("/health", response_model=HealthResponse, tags=["System"])
+@lru_cache(maxsize=1)
+def _health_payload(epoch_second: int) -> bytes:
+    """Serialized health payload, rebuilt at most once per second."""
+    return orjson.dumps(
+        HealthResponse(status="ok", service="BASTION", version="2.2.0").model_dump(mode="json")
+    )
+
+
+@app.get("/health", responses={200: {"model": HealthResponse}}, tags=["System"])
 async def health_check():
     """Health check endpoint."""
-    return HealthResponse(
-        status="ok",
-        service="BASTION",
-        version="2.2.0"
+    return Response(
+        content=_health_payload(int(time.time())),
+        media_type="application/json",
     )
 
 
-@app.post("/calculate", response_model=RiskLevelsResponse, tags=["Risk"])
-async def calculate_risk(request: CalculateRiskRequest):
+async def _calculate_levels(
+    request: CalculateRiskRequest,
+    risk_engine: RiskEngine,
+    data_fetcher: LiveDataFetcher,
+) -> RiskLevelsResponse:
+    """Fetch market data and run the risk engine for one request."""
+    logger.info(f"Calculating risk for {request.symbol} {request.direction} @ {request.entry_price}")
+
+    # Fetch market data for multiple timeframes - the only layer that maps
+    # failures to a specific status; engine errors fall through to the
+    # global exception handler as 500s
+    try:
+        primary_df = await data_fetcher.get_ohlcv(
+            symbol=request.symbol,
+            interval=request.timeframe,
+            limit=200
+        )
+    except Exception as e:
+        logger.error(f"Data fetch failed: {e}")
+        raise HTTPException(
+            status_code=502,
+            detail=f"Failed to fetch market data: {str(e)}"
+        )
+
+    if primary_df.empty:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Could not fetch market data for {request.symbol}"
+        )
+
+    # Build OHLCV data dict
+    ohlcv_data = {request.timeframe: primary_df}
+
+    # Try to fetch higher timeframe for MTF analysis
+    higher_tf = _get_higher_timeframe(request.timeframe)
+    if higher_tf:
+        try:
+            higher_df = await data_fetcher.get_ohlcv(
+                symbol=request.symbol,
+                interval=higher_tf,
+                limit=100
+            )
+            if not higher_df.empty:
+                ohlcv_data[higher_tf] = higher_df
+        except Exception:
+            pass  # Higher TF is optional
+
+    logger.info(f"Fetched data for {list(ohlcv_data.keys())}")
+
+    # Calculate risk levels using advanced engine
+    levels = await risk_engine.calculate_risk_levels(
+        symbol=request.symbol,
+        entry_price=request.entry_price,
+        direction=request.direction,
+        timeframe=request.timeframe,
+        account_balance=request.account_balance,
+        ohlcv_data=ohlcv_data,
+        risk_per_trade_pct=request.risk_per_trade_pct
+    )
+
+    logger.info(f"Risk calculated: {len(levels.stops)} stops, {len(levels.targets)} targets")
+
+    # Format response - engine output is trusted, so build plain dicts and
+    # assemble with model_construct to skip per-item output validation
+    return RiskLevelsResponse.model_construct(
+        symbol=levels.symbol,
+        entry_price=levels.entry_price,
+        direction=levels.direction,
+        current_price=levels.current_price,
+        stops=[
+            {
+                'type': s.get('type', 'unknown'),
+                'price': s['price'],
+                'distance_pct': s.get('distance_pct', 0),
+                'reason': s.get('reason', ''),
+                'confidence': s.get('confidence', 0.5),
+            }
+            for s in levels.stops
+        ],
+        targets=[
+            {
+                'price': t['price'],
+                'type': t.get('type', 'unknown'),
+                'exit_percentage': t.get('exit_percentage', 33),
+                'distance_pct': t.get('distance_pct', 0),
+                'reason': t.get('reason', ''),
+                'confidence': t.get('confidence', 0.5),
+            }
+            for t in levels.targets
+        ],
+        position_size=levels.position_size,
+        position_size_pct=levels.position_size_pct,
+        risk_amount=levels.risk_amount,
+        risk_reward_ratio=levels.risk_reward_ratio,
+        max_risk_reward_ratio=levels.max_risk_reward_ratio,
+        guarding_line=levels.guarding_line,
+        market_context={
+            'structure_quality': levels.structure_quality,
+            'volume_profile_score': levels.volume_profile_score,
+            'orderflow_bias': levels.orderflow_bias,
+            'mtf_alignment': levels.mtf_alignment,
+        }
+    )
+
+
+@app.post("/calculate", responses={200: {"model": RiskLevelsResponse}}, tags=["Risk"])
+async def calculate_risk(request: CalculateRiskRequest, http_request: Request):
     """
     Calculate risk levels for a trade setup.
     
@@ -247,124 +396,43 @@ async def calculate_risk(request: CalculateRiskRequest):
     - Volatility-adjusted position sizing
     - Market context (informational, not judgmental)
     """
-    try:
-        logger.info(f"Calculating risk for {request.symbol} {request.direction} @ {request.entry_price}")
-        
-        # Fetch market data for multiple timeframes
-        try:
-            # Primary timeframe
-            primary_df = await data_fetcher.get_ohlcv(
-                symbol=request.symbol,
-                interval=request.timeframe,
-                limit=200
-            )
-            
-            if primary_df.empty:
-                raise HTTPException(
-                    status_code=502,
-                    detail=f"Could not fetch market data for {request.symbol}"
-                )
-            
-            # Build OHLCV data dict
-            ohlcv_data = {request.timeframe: primary_df}
-            
-            # Try to fetch higher timeframe for MTF analysis
-            higher_tf = _get_higher_timeframe(request.timeframe)
-            if higher_tf:
-                try:
-                    higher_df = await data_fetcher.get_ohlcv(
-                        symbol=request.symbol,
-                        interval=higher_tf,
-                        limit=100
-                    )
-                    if not higher_df.empty:
-                        ohlcv_data[higher_tf] = higher_df
-                except Exception:
-                    pass  # Higher TF is optional
-            
-            logger.info(f"Fetched data for {list(ohlcv_data.keys())}")
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Data fetch failed: {e}")
-            raise HTTPException(
-                status_code=502,
-                detail=f"Failed to fetch market data: {str(e)}"
-            )
-        
-        # Calculate risk levels using advanced engine
-        try:
-            levels = await risk_engine.calculate_risk_levels(
-                symbol=request.symbol,
-                entry_price=request.entry_price,
-                direction=request.direction,
-                timeframe=request.timeframe,
-                account_balance=request.account_balance,
-                ohlcv_data=ohlcv_data,
-                risk_per_trade_pct=request.risk_per_trade_pct
-            )
-            
-            logger.info(f"Risk calculated: {len(levels.stops)} stops, {len(levels.targets)} targets")
-            
-        except Exception as e:
-            logger.error(f"Risk calculation failed: {e}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Risk calculation error: {str(e)}"
-            )
-        
-        # Format response
-        response = RiskLevelsResponse(
-            symbol=levels.symbol,
-            entry_price=levels.entry_price,
-            direction=levels.direction,
-            current_price=levels.current_price,
-            stops=[
-                StopLevelResponse(
-                    type=s.get('type', 'unknown'),
-                    price=s['price'],
-                    distance_pct=s.get('distance_pct', 0),
-                    reason=s.get('reason', ''),
-                    confidence=s.get('confidence', 0.5)
-                )
-                for s in levels.stops
-            ],
-            targets=[
-                TargetLevelResponse(
-                    price=t['price'],
-                    type=t.get('type', 'unknown'),
-                    exit_percentage=t.get('exit_percentage', 33),
-                    distance_pct=t.get('distance_pct', 0),
-                    reason=t.get('reason', ''),
-                    confidence=t.get('confidence', 0.5)
-                )
-                for t in levels.targets
-            ],
-            position_size=levels.position_size,
-            position_size_pct=levels.position_size_pct,
-            risk_amount=levels.risk_amount,
-            risk_reward_ratio=levels.risk_reward_ratio,
-            max_risk_reward_ratio=levels.max_risk_reward_ratio,
-            guarding_line=levels.guarding_line,
-            market_context=MarketContextResponse(
-                structure_quality=levels.structure_quality,
-                volume_profile_score=levels.volume_profile_score,
-                orderflow_bias=levels.orderflow_bias,
-                mtf_alignment=levels.mtf_alignment
-            )
-        )
-        
-        return response
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in /calculate: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Unexpected error: {str(e)}"
-        )
+    state = http_request.app.state
+    response = await _calculate_levels(request, state.risk_engine, state.data_fetcher)
+
+    # Serialize once through the cached adapter instead of letting FastAPI
+    # re-validate against response_model and walk it with jsonable_encoder
+    return Response(
+        content=RISK_LEVELS_ADAPTER.dump_json(response, warnings=False),
+        media_type="application/json",
+    )
+
+
+@app.post("/calculate/batch", responses={200: {"model": List[RiskLevelsResponse]}}, tags=["Risk"])
+async def calculate_risk_batch(requests: List[CalculateRiskRequest], http_request: Request):
+    """
+    Calculate risk levels for multiple trade setups in one call.
+    
+    Requests are processed concurrently - the fetcher's per-key locks
+    coalesce duplicate (symbol, timeframe) fetches, so portfolio scans
+    pay for each candle download only once. Items that fail return an
+    error entry in place of their result instead of failing the batch.
+    """
+    state = http_request.app.state
+    results = await asyncio.gather(
+        *(_calculate_levels(r, state.risk_engine, state.data_fetcher) for r in requests),
+        return_exceptions=True
+    )
+
+    payload = []
+    for request, result in zip(requests, results):
+        if isinstance(result, HTTPException):
+            payload.append({"symbol": request.symbol, "error": result.detail})
+        elif isinstance(result, Exception):
+            payload.append({"symbol": request.symbol, "error": str(result)})
+        else:
+            payload.append(result.model_dump(mode='json', warnings=False))
+
+    return BastionJSONResponse(content=payload)
 
 
 def _get_higher_timeframe(timeframe: str) -> str:
@@ -380,13 +448,30 @@ def _get_higher_timeframe(timeframe: str) -> str:
     return tf_hierarchy.get(timeframe.lower(), None)
 
 
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with long-lived caching for assets.
+
+    FileResponse already emits ETag/Last-Modified from mtime+size; this adds
+    Cache-Control so browsers stop revalidating unchanged assets. index.html
+    stays no-cache (revalidated via ETag) so UI updates are picked up.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        if response.media_type == "text/html":
+            response.headers["Cache-Control"] = "no-cache"
+        else:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
 # Mount static files for web calculator
 web_dir = bastion_path / "web"
 if web_dir.exists():
-    app.mount("/app", StaticFiles(directory=str(web_dir), html=True), name="web")
+    app.mount("/app", CachedStaticFiles(directory=str(web_dir), html=True), name="web")
     logger.info(f"Mounted web calculator at /app")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001, reload=True)
+    uvicorn.run(app, host="0.0.0.0", port=8001, loop="uvloop", http="httptools")
@@ -14,50 +14,92 @@ Endpoints:
     DELETE /session/{id}       - Close session
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import Annotated, List, Optional, Dict, Any, Literal
+from collections import OrderedDict
 from datetime import datetime
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+from api.models import TradeBaseRequest
 from core.session import (
     SessionManager, SessionState, SessionEntry,
     SessionUpdate, SessionStatus, ExitReason, TradePhase
 )
 from data.live_feed import LiveFeed
 
-router = APIRouter(prefix="/session", tags=["Sessions"])
+router = APIRouter(
+    prefix="/session",
+    tags=["Sessions"],
+    default_response_class=ORJSONResponse,
+)
+
+
+def get_manager(request: Request) -> SessionManager:
+    """Get the lifespan-managed session manager from app state."""
+    return request.app.state.session_manager
+
+
+def get_feed(request: Request) -> Optional[LiveFeed]:
+    """Get the lifespan-managed live feed from app state."""
+    return getattr(request.app.state, "live_feed", None)
+
 
-# Global instances (initialized in server.py)
-session_manager: SessionManager = None
-live_feed: LiveFeed = None
+ManagerDep = Annotated[SessionManager, Depends(get_manager)]
+FeedDep = Annotated[Optional[LiveFeed], Depends(get_feed)]
 
+# Default target ladders when a session is created without explicit
+# targets: (entry multiplier, exit %, reason)
+_LONG_TARGET_MULTS = (
+    (1.03, 33, "Target 1 (3%)"),
+    (1.06, 33, "Target 2 (6%)"),
+    (1.10, 34, "Target 3 (10%)"),
+)
+_SHORT_TARGET_MULTS = (
+    (0.97, 33, "Target 1 (3%)"),
+    (0.94, 33, "Target 2 (6%)"),
+    (0.90, 34, "Target 3 (10%)"),
+)
+
+# Exit-reason lookup built once at import - avoids the enum constructor
+# plus try/except per exit POST; unknown strings fall back to MANUAL
+_EXIT_REASON_MAP = {r.value: r for r in ExitReason}
+VALID_EXIT_REASONS = frozenset(_EXIT_REASON_MAP)
 
-def get_manager() -> SessionManager:
-    """Get the session manager instance."""
-    global session_manager
-    if session_manager is None:
-        session_manager = SessionManager()
-    return session_manager
+# Error details hoisted so repeated failure paths reuse one string
+_ERR_STRUCTURAL = "structural_support or structural_level is required"
+_ERR_SESSION_NOT_FOUND = "Session not found"
+_ERR_SHOT_FAILED = "Could not take shot - check session status"
+_ERR_EXIT_FAILED = "Could not execute exit"
 
+# Serialized GET /{session_id} responses keyed by session id, holding
+# (session version, payload bytes). A hit on an unchanged session skips
+# handler work and serialization entirely; bounded LRU to cap memory.
+_RESP_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_RESP_CACHE_MAX = 1024
 
-def get_feed() -> LiveFeed:
-    """Get the live feed instance."""
-    return live_feed
+# Strong refs to in-flight feed-subscribe tasks so they aren't GC'd
+# before completing (create_session fires them without awaiting)
+_subscribe_tasks: set = set()
+
+
+def _on_subscribe_done(task: asyncio.Task) -> None:
+    _subscribe_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.warning("Could not subscribe to feed: %s", task.exception())
 
 
 # =============================================================================
 # REQUEST MODELS
 # =============================================================================
 
-class CreateSessionRequest(BaseModel):
+class CreateSessionRequest(TradeBaseRequest):
     """Request to create a new trading session."""
-    symbol: str = Field(default="BTCUSDT", description="Trading pair")
-    direction: str = Field(..., pattern="^(long|short)$", description="Trade direction")
-    timeframe: str = Field(default="4h", description="Candle timeframe")
-    account_balance: float = Field(default=100000, gt=0, description="Account balance USD")
     structural_support: Optional[float] = Field(None, gt=0, description="Grade 3-4 validated support level")
     structural_level: Optional[float] = Field(None, gt=0, description="Alias for structural_support")
     entry_price: Optional[float] = Field(None, gt=0, description="Entry price for first shot")
@@ -226,8 +268,8 @@ class ExitResponse(BaseModel):
 # ENDPOINTS
 # =============================================================================
 
-@router.post("/create", response_model=SessionResponse)
-async def create_session(request: CreateSessionRequest):
+@router.post("/create", responses={200: {"model": SessionResponse}})
+async def create_session(request: CreateSessionRequest, manager: ManagerDep, feed: FeedDep):
     """
     Create a new trading session.
     
@@ -239,30 +281,20 @@ async def create_session(request: CreateSessionRequest):
     - Auto-subscribes to live price feed
     - Optionally takes first shot if entry_price provided
     """
-    manager = get_manager()
-    feed = get_feed()
-    
     # Accept either structural_support or structural_level
     structural = request.structural_support or request.structural_level
     if not structural:
-        raise HTTPException(status_code=400, detail="structural_support or structural_level is required")
+        raise HTTPException(status_code=400, detail=_ERR_STRUCTURAL)
     
     # Generate default targets if none provided
     targets = request.targets
     if not targets and request.entry_price:
         entry = request.entry_price
-        if request.direction == "long":
-            targets = [
-                {"price": entry * 1.03, "exit_percentage": 33, "reason": "Target 1 (3%)"},
-                {"price": entry * 1.06, "exit_percentage": 33, "reason": "Target 2 (6%)"},
-                {"price": entry * 1.10, "exit_percentage": 34, "reason": "Target 3 (10%)"},
-            ]
-        else:
-            targets = [
-                {"price": entry * 0.97, "exit_percentage": 33, "reason": "Target 1 (3%)"},
-                {"price": entry * 0.94, "exit_percentage": 33, "reason": "Target 2 (6%)"},
-                {"price": entry * 0.90, "exit_percentage": 34, "reason": "Target 3 (10%)"},
-            ]
+        table = _LONG_TARGET_MULTS if request.direction == "long" else _SHORT_TARGET_MULTS
+        targets = [
+            {"price": entry * mult, "exit_percentage": pct, "reason": reason}
+            for mult, pct, reason in table
+        ]
     
     session = manager.create_session(
         symbol=request.symbol,
@@ -276,14 +308,17 @@ async def create_session(request: CreateSessionRequest):
         timeout_hours=request.timeout_hours,
     )
     
-    # Auto-subscribe to live feed for this symbol
+    # Auto-subscribe to live feed for this symbol - fire-and-forget so the
+    # response doesn't wait on the subscribe round trip
     if feed:
-        try:
-            await feed.subscribe(request.symbol, timeframes=[request.timeframe])
-        except Exception as e:
-            logger.warning(f"Could not subscribe to feed: {e}")
+        task = asyncio.create_task(
+            feed.subscribe(request.symbol, timeframes=[request.timeframe])
+        )
+        _subscribe_tasks.add(task)
+        task.add_done_callback(_on_subscribe_done)
     
-    # Take first shot if entry price provided
+    # Take first shot if entry price provided. take_shot mutates the same
+    # SessionState object we already hold, so no reload is needed.
     if request.entry_price:
         # Estimate ATR as 2% of entry price if not provided
         est_atr = request.entry_price * 0.02
@@ -292,14 +327,12 @@ async def create_session(request: CreateSessionRequest):
             entry_price=request.entry_price,
             current_atr=est_atr,
         )
-        # Refresh session state
-        session = manager.get_session(session.id)
-    
-    return SessionResponse(**session.to_dict())
+
+    return ORJSONResponse(content=session.to_dict())
 
 
-@router.post("/{session_id}/shot", response_model=ShotResponse)
-async def take_shot(session_id: str, request: TakeShotRequest):
+@router.post("/{session_id}/shot", responses={200: {"model": ShotResponse}})
+async def take_shot(session_id: str, request: TakeShotRequest, manager: ManagerDep):
     """
     Take a shot (entry) in the session.
     
@@ -310,8 +343,6 @@ async def take_shot(session_id: str, request: TakeShotRequest):
     
     Position size calculated as: risk_amount / (entry - stop)
     """
-    manager = get_manager()
-    
     # Estimate ATR if not provided (2% of entry price)
     atr = request.current_atr or (request.entry_price * 0.02)
     
@@ -323,26 +354,26 @@ async def take_shot(session_id: str, request: TakeShotRequest):
     )
     
     if not entry:
-        raise HTTPException(status_code=400, detail="Could not take shot - check session status")
+        raise HTTPException(status_code=400, detail=_ERR_SHOT_FAILED)
     
     session = manager.get_session(session_id)
     
-    return ShotResponse(
-        id=entry.id,
-        shot_number=entry.shot_number,
-        entry_price=entry.entry_price,
-        size=entry.size,
-        risk_amount=entry.risk_amount,
-        stop_price=entry.stop_price,
-        session_status=session.status.value,
-        total_size=session.total_size,
-        average_entry=session.average_entry,
-        risk_remaining=session.risk_remaining,
-    )
-
-
-@router.post("/{session_id}/update", response_model=SessionUpdateResponse)
-async def update_session(session_id: str, request: UpdateSessionRequest):
+    return ORJSONResponse(content={
+        "id": entry.id,
+        "shot_number": entry.shot_number,
+        "entry_price": entry.entry_price,
+        "size": entry.size,
+        "risk_amount": entry.risk_amount,
+        "stop_price": entry.stop_price,
+        "session_status": session.status.value,
+        "total_size": session.total_size,
+        "average_entry": session.average_entry,
+        "risk_remaining": session.risk_remaining,
+    })
+
+
+@router.post("/{session_id}/update", responses={200: {"model": SessionUpdateResponse}})
+async def update_session(session_id: str, request: UpdateSessionRequest, manager: ManagerDep):
     """
     Update session with new bar data.
     
@@ -360,8 +391,6 @@ async def update_session(session_id: str, request: UpdateSessionRequest):
     5. Momentum exhaustion
     6. Volume climax
     """
-    manager = get_manager()
-    
     update = manager.update_session(
         session_id=session_id,
         current_price=request.current_price,
@@ -373,27 +402,11 @@ async def update_session(session_id: str, request: UpdateSessionRequest):
         volume_climax=request.volume_climax,
     )
     
-    return SessionUpdateResponse(
-        session_id=update.session_id,
-        status=update.status.value,
-        phase=update.phase.value,
-        current_price=update.current_price,
-        bars_in_trade=update.bars_in_trade,
-        current_stop=update.current_stop,
-        guarding_level=update.guarding_level,
-        stop_moved=update.stop_moved,
-        exit_signal=update.exit_signal,
-        exit_reason=update.exit_reason.value if update.exit_reason else None,
-        exit_percentage=update.exit_percentage,
-        target_hit=update.target_hit,
-        unrealized_pnl=update.unrealized_pnl,
-        unrealized_pnl_pct=update.unrealized_pnl_pct,
-        alerts=update.alerts,
-    )
+    return ORJSONResponse(content=update.to_dict())
 
 
-@router.post("/{session_id}/exit", response_model=ExitResponse)
-async def execute_exit(session_id: str, request: ExecuteExitRequest):
+@router.post("/{session_id}/exit", responses={200: {"model": ExitResponse}})
+async def execute_exit(session_id: str, request: ExecuteExitRequest, manager: ManagerDep):
     """
     Execute an exit (full or partial).
     
@@ -407,18 +420,13 @@ async def execute_exit(session_id: str, request: ExecuteExitRequest):
     - safety_net_5pct: Max loss hit
     - manual_exit: User-initiated
     """
-    manager = get_manager()
-    
     session = manager.get_session(session_id)
     if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+        raise HTTPException(status_code=404, detail=_ERR_SESSION_NOT_FOUND)
     
     # Use exit_reason or reason alias
     reason_str = request.exit_reason or request.reason or "manual_exit"
-    try:
-        reason = ExitReason(reason_str)
-    except ValueError:
-        reason = ExitReason.MANUAL
+    reason = _EXIT_REASON_MAP.get(reason_str, ExitReason.MANUAL)
     
     # Use provided exit_price or current price
     exit_price = request.exit_price or session.current_price
@@ -434,112 +442,115 @@ async def execute_exit(session_id: str, request: ExecuteExitRequest):
     )
     
     if not result:
-        raise HTTPException(status_code=400, detail="Could not execute exit")
+        raise HTTPException(status_code=400, detail=_ERR_EXIT_FAILED)
     
     session = manager.get_session(session_id)
     
-    return ExitResponse(
-        price=result.price,
-        size=result.size,
-        percentage=result.percentage,
-        reason=result.reason,
-        pnl=result.pnl,
-        session_status=session.status.value,
-        remaining_size=session.remaining_size,
-        realized_pnl=session.realized_pnl,
-    )
+    return ORJSONResponse(content={
+        "price": result.price,
+        "size": result.size,
+        "percentage": result.percentage,
+        "reason": result.reason,
+        "pnl": result.pnl,
+        "session_status": session.status.value,
+        "remaining_size": session.remaining_size,
+        "realized_pnl": session.realized_pnl,
+    })
 
 
-@router.get("/{session_id}", response_model=SessionResponse)
-async def get_session(session_id: str):
+@router.get("/stream")
+async def stream_sessions(manager: ManagerDep, symbol: str = None):
+    """
+    Stream active sessions as NDJSON (one session per line).
+
+    Unlike the list endpoints, this never buffers the full result set -
+    each session is serialized and flushed as it is visited, so large
+    session counts cost one session of memory and time-to-first-byte
+    stays constant.
+    """
+    async def _gen():
+        for s in manager.iter_active(symbol):
+            yield orjson.dumps(s.to_dict()) + b"\n"
+
+    return StreamingResponse(_gen(), media_type="application/x-ndjson")
+
+
+@router.get("/{session_id}", responses={200: {"model": SessionResponse}})
+async def get_session(session_id: str, manager: ManagerDep):
     """Get session state by ID."""
-    manager = get_manager()
-    
     session = manager.get_session(session_id)
     if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    return SessionResponse(**session.to_dict())
+        raise HTTPException(status_code=404, detail=_ERR_SESSION_NOT_FOUND)
+
+    version = session._version
+    cached = _RESP_CACHE.get(session_id)
+    if cached and cached[0] == version:
+        _RESP_CACHE.move_to_end(session_id)
+        return Response(content=cached[1], media_type="application/json")
+
+    payload = orjson.dumps(session.to_dict())
+    _RESP_CACHE[session_id] = (version, payload)
+    _RESP_CACHE.move_to_end(session_id)
+    if len(_RESP_CACHE) > _RESP_CACHE_MAX:
+        _RESP_CACHE.popitem(last=False)
+
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/{session_id}/summary")
-async def get_session_summary(session_id: str):
+async def get_session_summary(session_id: str, manager: ManagerDep):
     """Get session performance summary."""
-    manager = get_manager()
-    
     summary = manager.get_session_summary(session_id)
     if not summary:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    return summary
+        raise HTTPException(status_code=404, detail=_ERR_SESSION_NOT_FOUND)
 
+    return ORJSONResponse(content=summary)
 
-@router.get("/", response_model=List[SessionResponse])
-async def list_sessions(symbol: str = None, active_only: bool = True):
+
+@router.get("/", responses={200: {"model": List[SessionResponse]}})
+async def list_sessions(manager: ManagerDep, symbol: str = None, active_only: bool = True):
     """List sessions, optionally filtered by symbol."""
-    manager = get_manager()
-    
     if active_only:
         sessions = manager.get_active_sessions(symbol)
+    elif symbol:
+        sessions = manager.get_sessions_for_symbol(symbol)
     else:
         sessions = list(manager._sessions.values())
-        if symbol:
-            sessions = [s for s in sessions if s.symbol == symbol]
-    
-    return [SessionResponse(**s.to_dict()) for s in sessions]
+
+    return ORJSONResponse(content=[s.to_dict() for s in sessions])
 
 
 @router.get("/list")
-async def list_sessions_alt(symbol: str = None, active_only: bool = True):
+async def list_sessions_alt(manager: ManagerDep, symbol: str = None, active_only: bool = True):
     """Alternative list endpoint for UI compatibility."""
-    manager = get_manager()
-    
     if active_only:
         sessions = manager.get_active_sessions(symbol)
+    elif symbol:
+        sessions = manager.get_sessions_for_symbol(symbol)
     else:
         sessions = list(manager._sessions.values())
-        if symbol:
-            sessions = [s for s in sessions if s.symbol == symbol]
-    
-    return {"sessions": [s.to_dict() for s in sessions]}
+
+    return ORJSONResponse(content={"sessions": [s.to_dict() for s in sessions]})
 
 
 @router.get("/{session_id}/state")
-async def get_session_state(session_id: str):
+async def get_session_state(session_id: str, manager: ManagerDep):
     """Get full session state for UI updates."""
-    manager = get_manager()
-    
     session = manager.get_session(session_id)
     if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    state = session.to_dict()
+        raise HTTPException(status_code=404, detail=_ERR_SESSION_NOT_FOUND)
     
-    # Add UI-friendly fields
-    state['entry_price'] = session.average_entry
-    state['position_size'] = session.total_size
-    state['risk_amount'] = session.risk_used
-    state['total_risk_budget'] = session.account_balance * (session.total_risk_cap_pct / 100)
-    state['bars_in_trade'] = session.bars_in_trade
-    state['avg_entry'] = session.average_entry
-    state['total_size'] = session.total_size
-    state['unrealized_pnl'] = session.unrealized_pnl
-    state['unrealized_pnl_pct'] = session.unrealized_pnl_pct
-    state['realized_pnl'] = session.realized_pnl
-    state['current_price'] = session.current_price
-    state['guarding_line'] = session.guarding_level
-    
-    return state
+    # Both halves are memoized on the session; the merge builds a fresh
+    # dict so neither cache is mutated
+    return ORJSONResponse(content=session.to_dict() | session.ui_extras())
 
 
 @router.delete("/{session_id}")
-async def close_session(session_id: str):
+async def close_session(session_id: str, manager: ManagerDep):
     """Close a session (does not exit position)."""
-    manager = get_manager()
-    
     success = manager.close_session(session_id, reason="api_close")
     if not success:
-        raise HTTPException(status_code=404, detail="Session not found")
+        raise HTTPException(status_code=404, detail=_ERR_SESSION_NOT_FOUND)
     
-    return {"status": "closed", "session_id": session_id}
+    return ORJSONResponse(content={"status": "closed", "session_id": session_id})
 
@@ -0,0 +1,239 @@
+"""
+Numeric Hot-Path Kernels
+========================
+
+Tight numeric loops factored out of the session and structure hot paths
+so they can be JIT-compiled. Numba is optional: when it is installed the
+kernels run under ``@njit(cache=True)``; otherwise the same functions run
+as plain Python with identical results (callers with a vectorized NumPy
+alternative should check ``NUMBA_AVAILABLE`` and prefer that instead).
+"""
+
+import numpy as np
+
+try:  # pragma: no cover - exercised only when numba is installed
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True)
+def update_pnl_core(
+    current_price: float,
+    average_entry: float,
+    remaining_size: float,
+    account_balance: float,
+    structural_stop: float,
+    is_long: bool,
+) -> tuple:
+    """
+    Per-bar P&L arithmetic for an open session.
+
+    Returns:
+        (unrealized_pnl, unrealized_pnl_pct, r_multiple)
+    """
+    if is_long:
+        profit_distance = current_price - average_entry
+    else:
+        profit_distance = average_entry - current_price
+
+    unrealized_pnl = profit_distance * remaining_size
+    unrealized_pnl_pct = (unrealized_pnl / account_balance) * 100.0
+
+    risk_distance = abs(average_entry - structural_stop)
+    r_multiple = profit_distance / risk_distance if risk_distance > 0 else 0.0
+
+    return unrealized_pnl, unrealized_pnl_pct, r_multiple
+
+
+@njit(cache=True)
+def fractal_swing_scan(
+    arr: np.ndarray,
+    lookback: int,
+    current_bar: int,
+    is_high: bool,
+) -> tuple:
+    """
+    Fractal swing scan over a float64 price array.
+
+    A swing high is strictly above ``lookback`` bars to the left and at
+    or above ``lookback`` bars to the right (mirrored for swing lows).
+    Strength measures how far the swing sticks out of its surrounding
+    bars in standard deviations, normalized to 0-1.
+
+    Returns:
+        (indices, strengths) arrays, truncated to the detected swings.
+    """
+    n = current_bar - lookback + 1
+    width = 2 * lookback
+    count = 0
+    idx_out = np.empty(max(n, 1), np.int64)
+    strength_out = np.empty(max(n, 1), np.float64)
+
+    for i in range(lookback, n):
+        center = arr[i]
+        ok = True
+        for j in range(1, lookback + 1):
+            if is_high:
+                if not (center > arr[i - j] and center >= arr[i + j]):
+                    ok = False
+                    break
+            else:
+                if not (center < arr[i - j] and center <= arr[i + j]):
+                    ok = False
+                    break
+        if not ok:
+            continue
+
+        total = 0.0
+        for j in range(i - lookback, i + lookback + 1):
+            if j != i:
+                total += arr[j]
+        mean = total / width
+
+        var = 0.0
+        for j in range(i - lookback, i + lookback + 1):
+            if j != i:
+                d = arr[j] - mean
+                var += d * d
+        std = (var / width) ** 0.5
+
+        raw = center - mean if is_high else mean - center
+        strength = raw / std / 3.0 if std > 0.0 else 1.0
+        if strength < 0.0:
+            strength = 0.0
+        elif strength > 1.0:
+            strength = 1.0
+
+        idx_out[count] = i
+        strength_out[count] = strength
+        count += 1
+
+    return idx_out[:count], strength_out[:count]
+
+
+@njit(cache=True)
+def guard_swing_scan(prices: np.ndarray, find_lows: bool) -> tuple:
+    """
+    Two-bar fractal scan used by the guarding line: swing lows when
+    ``find_lows`` (longs), swing highs otherwise (shorts).
+
+    Returns:
+        (indices, values) arrays, truncated to the detected swings.
+    """
+    n = prices.shape[0]
+    count = 0
+    idx_out = np.empty(max(n - 4, 1), np.int64)
+    val_out = np.empty(max(n - 4, 1), np.float64)
+
+    for i in range(2, n - 2):
+        c = prices[i]
+        if find_lows:
+            ok = (c < prices[i - 1] and c < prices[i - 2]
+                  and c < prices[i + 1] and c < prices[i + 2])
+        else:
+            ok = (c > prices[i - 1] and c > prices[i - 2]
+                  and c > prices[i + 1] and c > prices[i + 2])
+        if ok:
+            idx_out[count] = i
+            val_out[count] = c
+            count += 1
+
+    return idx_out[:count], val_out[:count]
+
+
+@njit(cache=True)
+def atr_core(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int,
+) -> float:
+    """
+    Average True Range over the trailing ``period`` bars.
+
+    True range uses the previous bar's close; when fewer than ``period``
+    ranges exist the mean runs over whatever is available, matching the
+    NumPy implementation in RiskEngine._calculate_atr.
+    """
+    n = high.shape[0]
+    m = n - 1 if n - 1 < period else period
+    if m <= 0:
+        return 0.0
+
+    total = 0.0
+    for i in range(n - m, n):
+        prev_close = close[i - 1]
+        tr = high[i] - low[i]
+        d = high[i] - prev_close
+        if d < 0.0:
+            d = -d
+        if d > tr:
+            tr = d
+        d = low[i] - prev_close
+        if d < 0.0:
+            d = -d
+        if d > tr:
+            tr = d
+        total += tr
+    return total / m
+
+
+@njit(cache=True)
+def slope_fit_core(y: np.ndarray) -> tuple:
+    """
+    Closed-form degree-1 fit plus R-squared over an implicit 0..n-1 x axis.
+
+    Returns:
+        (slope, intercept, y_mean, r_squared) with r_squared unclamped.
+    """
+    n = y.shape[0]
+    x_mean = (n - 1) * 0.5
+
+    y_sum = 0.0
+    for i in range(n):
+        y_sum += y[i]
+    y_mean = y_sum / n
+
+    sxy = 0.0
+    sxx = 0.0
+    for i in range(n):
+        dx = i - x_mean
+        sxy += dx * (y[i] - y_mean)
+        sxx += dx * dx
+    slope = sxy / sxx if sxx > 0.0 else 0.0
+    intercept = y_mean - slope * x_mean
+
+    ss_res = 0.0
+    ss_tot = 0.0
+    for i in range(n):
+        resid = y[i] - (slope * i + intercept)
+        ss_res += resid * resid
+        dev = y[i] - y_mean
+        ss_tot += dev * dev
+    r_squared = 1.0 - ss_res / ss_tot if ss_tot > 0.0 else 0.0
+
+    return slope, intercept, y_mean, r_squared
+
+
+def warm_kernels() -> None:
+    """Trigger JIT compilation off the request path (no-op without numba)."""
+    update_pnl_core(100.0, 99.0, 1.0, 1000.0, 98.0, True)
+    fractal_swing_scan(np.array([1.0, 2.0, 3.0, 2.0, 1.0]), 2, 4, True)
+    guard_swing_scan(np.array([3.0, 2.0, 1.0, 2.0, 3.0]), True)
+    atr_core(np.array([2.0, 3.0]), np.array([1.0, 2.0]), np.array([1.5, 2.5]), 14)
+    slope_fit_core(np.array([1.0, 2.0, 3.0]))
+
+
+# Pay the compile cost at import time rather than on the first /update
+warm_kernels()
@@ -29,9 +29,12 @@ from enum import Enum
 import numpy as np
 import pandas as pd
 from datetime import datetime
+from math import fabs as _fabs
 import logging
 import asyncio
+import time
 
+from ._update_kernel import NUMBA_AVAILABLE, atr_core, guard_swing_scan, slope_fit_core
 from .vpvr_analyzer import VPVRAnalyzer, VPVRAnalysis
 from .structure_detector import StructureDetector, StructureAnalysis
 from .mtf_structure import MTFStructureAnalyzer, MTFAlignment
@@ -39,6 +42,31 @@ from .orderflow_detector import OrderFlowDetector, OrderFlowAnalysis
 
 logger = logging.getLogger(__name__)
 
+# Timeframes suitable for swing trading (already lowercased - checked on
+# every update_position call, so no per-call set building)
+_SWING_TFS = frozenset({"4h", "1d", "1w", "daily", "weekly"})
+
+
+def _linfit(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """
+    Closed-form degree-1 least-squares fit.
+
+    np.polyfit builds a Vandermonde matrix and dispatches to LAPACK,
+    which dwarfs the actual math for the <=20-point fits used here; the
+    analytic slope/intercept is two dot products.
+
+    Returns:
+        (slope, intercept)
+    """
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    denom = np.dot(dx, dx)
+    if denom == 0.0:
+        return 0.0, float(y_mean)
+    slope = np.dot(dx, y - y_mean) / denom
+    return float(slope), float(y_mean - slope * x_mean)
+
 
 # =============================================================================
 # ENUMS
@@ -79,7 +107,7 @@ class VolatilityRegime(str, Enum):
 # DATA MODELS
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class TradeSetup:
     """Input to the RiskEngine representing a potential trade."""
     symbol: str
@@ -90,7 +118,7 @@ class TradeSetup:
     risk_per_trade_pct: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionUpdate:
     """Real-time position update for dynamic stop/target adjustment."""
     current_price: float
@@ -102,7 +130,7 @@ class PositionUpdate:
     recent_highs: Optional[List[float]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskLevels:
     """Risk levels output - pure risk management, no trade scoring."""
     
@@ -156,9 +184,17 @@ class RiskLevels:
     breakeven_price: float = 0.0         # Price for breakeven stop
     one_r_price: float = 0.0             # Price at +1R profit
     
-    # Timestamp
-    calculated_at: datetime = field(default_factory=datetime.now)
-    
+    # Timestamp, kept as a raw nanosecond clock read: datetime.now() costs
+    # microseconds per construction while time.time_ns is a bare clock
+    # call, and most instances are never serialized
+    calculated_at_ns: int = field(default_factory=time.time_ns)
+
+    @property
+    def calculated_at(self) -> datetime:
+        """Construction time, materialized as a datetime on demand."""
+        return datetime.fromtimestamp(self.calculated_at_ns / 1e9)
+
+
     def to_dict(self) -> Dict:
         return {
             'symbol': self.symbol,
@@ -199,12 +235,12 @@ class RiskLevels:
     def get_primary_stop(self) -> Optional[Dict]:
         """Get the tightest (primary) stop level."""
         for stop in self.stops:
-            if stop.get('type') == 'primary' or stop.get('type') == 'structural':
+            if stop.get('type') in ('primary', 'structural'):
                 return stop
         return self.stops[0] if self.stops else None
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskUpdate:
     """Output from dynamic risk updates (position management)."""
     updated_stops: List[Dict[str, Any]] = field(default_factory=list)
@@ -357,18 +393,20 @@ class GuardingLineManager:
                 "slope_source": "default"
             }
         
-        recent = price_data[:min(lookback, len(price_data))]
+        # Convert once up front so the lookback slice below is a zero-copy
+        # view (callers already pass ndarrays on the hot path; list input
+        # from the API pays the conversion a single time here)
+        prices = np.asarray(price_data, dtype=np.float64)
+        recent = prices[:min(lookback, len(prices))]
         swing_points = self._find_swing_points(recent, direction)
-        
+
         # Calculate slope from swing points (preferred) or all data
         if len(swing_points) >= 2:
             slope = self._calculate_dynamic_slope(swing_points, direction, entry_price)
             slope_source = "swing_regression"
         else:
             # Fallback: use linear regression on all recent data
-            x = np.arange(len(recent))
-            y = np.array(recent)
-            slope, _ = np.polyfit(x, y, 1)
+            slope, _ = _linfit(np.arange(len(recent)), recent)
             slope_source = "linear_regression"
         
         # Enforce slope direction matches trade direction
@@ -389,10 +427,10 @@ class GuardingLineManager:
         # Calculate intercept with buffer
         if direction == "long":
             # Start below the lowest recent swing low
-            base_intercept = min(recent) if recent else entry_price * 0.97
+            base_intercept = recent.min() if len(recent) else entry_price * 0.97
             intercept = base_intercept * (1 - self.buffer_pct / 100)
         else:
-            base_intercept = max(recent) if recent else entry_price * 1.03
+            base_intercept = recent.max() if len(recent) else entry_price * 1.03
             intercept = base_intercept * (1 + self.buffer_pct / 100)
         
         return {
@@ -420,13 +458,13 @@ class GuardingLineManager:
             return entry_price * (self.min_slope_pct / 100)
         
         # Use linear regression on swing points
-        x = np.array([p[0] for p in swing_points])
-        y = np.array([p[1] for p in swing_points])
-        
+        x = np.array([p[0] for p in swing_points], dtype=np.float64)
+        y = np.array([p[1] for p in swing_points], dtype=np.float64)
+
         # Fit line to swing points
-        slope, _ = np.polyfit(x, y, 1)
-        
-        return float(slope)
+        slope, _ = _linfit(x, y)
+
+        return slope
     
     def update_slope(
         self,
@@ -470,42 +508,94 @@ class GuardingLineManager:
         bars_active = bars_since_entry - activation
         return intercept + (slope * bars_active)
     
+    def check_breaks_batch(
+        self,
+        line_params_list: List[Dict[str, float]],
+        current_prices: np.ndarray,
+        bars_since_entry: np.ndarray,
+        directions: List[str],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate many guarding lines in one vectorized pass.
+
+        Stacks the per-position line parameters into arrays and computes
+        every current level and break flag at once, instead of looping
+        get_current_level/check_break per position.
+
+        Returns:
+            (levels, broken) arrays aligned with the input order.
+        """
+        n = len(line_params_list)
+        if n == 0:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=bool)
+
+        slopes = np.fromiter(
+            (lp["slope"] for lp in line_params_list), dtype=np.float64, count=n
+        )
+        intercepts = np.fromiter(
+            (lp["intercept"] for lp in line_params_list), dtype=np.float64, count=n
+        )
+        activations = np.fromiter(
+            (lp.get("activation_bar", self.activation_bars) for lp in line_params_list),
+            dtype=np.float64, count=n,
+        )
+        signs = np.fromiter(
+            (1.0 if d == "long" else -1.0 for d in directions), dtype=np.float64, count=n
+        )
+
+        bars = np.asarray(bars_since_entry, dtype=np.float64)
+        prices = np.asarray(current_prices, dtype=np.float64)
+
+        # Same semantics as get_current_level: parked far from price
+        # before activation, then trailing from the activation bar
+        inactive = intercepts * np.where(slopes >= 0, 0.9, 1.1)
+        active = intercepts + slopes * (bars - activations)
+        levels = np.where(bars < activations, inactive, active)
+
+        broken = signs * (prices - levels) < 0
+        return levels, broken
+
     def check_break(self, current_price: float, guarding_level: float, direction: str) -> Tuple[bool, str]:
         """Check if guarding line is broken."""
-        if direction == "long" and current_price < guarding_level:
-            return True, f"Price {current_price:.2f} broke below guarding at {guarding_level:.2f}"
-        elif direction == "short" and current_price > guarding_level:
-            return True, f"Price {current_price:.2f} broke above guarding at {guarding_level:.2f}"
+        # Sign-normalized: +1 long (break = below), -1 short (break = above)
+        sign = 1.0 if direction == "long" else -1.0
+        if sign * (current_price - guarding_level) < 0:
+            side = "below" if sign > 0 else "above"
+            return True, f"Price {current_price:.2f} broke {side} guarding at {guarding_level:.2f}"
         return False, ""
     
     def _find_swing_points(self, prices: List[float], direction: str) -> List[Tuple[int, float]]:
         """Find swing lows (long) or swing highs (short) using fractal detection."""
-        swing_points = []
-        
         # Need at least 5 bars for fractal detection
         if len(prices) < 5:
-            return swing_points
-        
-        for i in range(2, len(prices) - 2):
-            if direction == "long":
-                # Swing low: lower than 2 bars on each side
-                if (prices[i] < prices[i-1] and prices[i] < prices[i-2] and 
-                    prices[i] < prices[i+1] and prices[i] < prices[i+2]):
-                    swing_points.append((i, prices[i]))
-            else:
-                # Swing high: higher than 2 bars on each side
-                if (prices[i] > prices[i-1] and prices[i] > prices[i-2] and 
-                    prices[i] > prices[i+1] and prices[i] > prices[i+2]):
-                    swing_points.append((i, prices[i]))
-        
-        return swing_points
+            return []
+
+        p = np.ascontiguousarray(prices, dtype=np.float64)
+
+        if NUMBA_AVAILABLE:
+            # JIT-compiled native scan, no intermediate mask arrays
+            idx, vals = guard_swing_scan(p, direction == "long")
+            return list(zip(idx.tolist(), vals.tolist()))
+
+        # The five scalar comparisons per bar collapse into four shifted
+        # slice compares evaluated as C loops over the whole array
+        center = p[2:-2]
+        if direction == "long":
+            # Swing low: lower than 2 bars on each side
+            mask = (center < p[1:-3]) & (center < p[:-4]) & (center < p[3:-1]) & (center < p[4:])
+        else:
+            # Swing high: higher than 2 bars on each side
+            mask = (center > p[1:-3]) & (center > p[:-4]) & (center > p[3:-1]) & (center > p[4:])
+
+        idx = np.flatnonzero(mask) + 2
+        return list(zip(idx.tolist(), p[idx].tolist()))
 
 
 # =============================================================================
 # MOMENTUM TRAILING TAKE-PROFIT (Living TP)
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class MomentumState:
     """Tracks the momentum trailing TP state."""
     active: bool = False
@@ -590,24 +680,24 @@ class MomentumTrailingTP:
         
         recent = closes[-self.slope_lookback:] if len(closes) >= self.slope_lookback else closes
         
-        # Calculate slope using linear regression
-        x = np.arange(len(recent))
-        y = np.array(recent)
-        
-        if len(x) < 2:
+        y = np.ascontiguousarray(recent, dtype=np.float64)
+        if len(y) < 2:
             return 0.0, 0.0
-        
-        slope, intercept = np.polyfit(x, y, 1)
-        
+
+        # Slope, intercept and R-squared (how clean the move is) in one
+        # pass: JIT kernel when numba is installed, NumPy otherwise
+        if NUMBA_AVAILABLE:
+            slope, intercept, avg_price, r_squared = slope_fit_core(y)
+        else:
+            x = np.arange(len(y))
+            slope, intercept = _linfit(x, y)
+            avg_price = float(y.mean())
+            ss_res = np.sum((y - (slope * x + intercept)) ** 2)
+            ss_tot = np.sum((y - avg_price) ** 2)
+            r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
+
         # Normalize slope to percentage per bar
-        avg_price = np.mean(recent)
         slope_pct = (slope / avg_price) * 100 if avg_price > 0 else 0
-        
-        # Calculate R-squared (how clean is the move)
-        y_pred = slope * x + intercept
-        ss_res = np.sum((y - y_pred) ** 2)
-        ss_tot = np.sum((y - np.mean(y)) ** 2)
-        r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
         r_squared = max(0, min(1, r_squared))
         
         # Strength = magnitude of slope * cleanness of move
@@ -880,6 +970,29 @@ class RiskEngine:
         
         # Per-position momentum states (keyed by symbol or session)
         self._momentum_states: Dict[str, MomentumState] = {}
+
+        # Config-derived constants used on every stop/target calculation,
+        # cached as bare floats so the hot paths skip the attribute chains
+        self._atr_mult = self.config.atr_stop_multiplier
+        self._atr_mult_secondary = self.config.atr_stop_multiplier * 1.5
+        self._max_stop_pct = self.config.max_stop_pct
+        self._max_stop_frac = self.config.max_stop_pct / 100
+        self._exit_ratios = tuple(self.config.partial_exit_ratios)
+
+        # Trailing-stop lock-in multipliers (just above/below entry)
+        self._trail_lock_long = 1.001
+        self._trail_lock_short = 0.999
+
+        # Direction-specialized dispatch: resolved once per calculation so
+        # the hot bodies carry no per-line direction branches
+        self._stops_by_dir = {
+            "long": self._calculate_stops_long,
+            "short": self._calculate_stops_short,
+        }
+        self._targets_by_dir = {
+            "long": self._calculate_targets_long,
+            "short": self._calculate_targets_short,
+        }
     
     async def calculate_risk_levels(
         self,
@@ -913,38 +1026,61 @@ class RiskEngine:
             symbol=symbol,
         )
         
+        # Degenerate inputs would only produce garbage levels - bail out
+        # before the expensive detector passes
+        if entry_price <= 0:
+            logger.error(f"Invalid entry price {entry_price} for {symbol}")
+            return levels
+
         primary_df = ohlcv_data.get(timeframe)
         if primary_df is None or len(primary_df) < 50:
             logger.error(f"Insufficient data for timeframe {timeframe}")
             return levels
         
-        # Current price
-        levels.current_price = float(primary_df['close'].iloc[-1])
-        
+        # Hoist the numpy views once - every downstream consumer (ATR,
+        # volatility regime, guarding line) shares these instead of
+        # re-extracting columns through pandas label resolution
+        high_np = primary_df['high'].to_numpy()
+        low_np = primary_df['low'].to_numpy()
+        close_np = primary_df['close'].to_numpy()
+
+        levels.current_price = float(close_np[-1])
+
         # Calculate ATR
-        atr = self._calculate_atr(primary_df)
+        atr = self._calculate_atr(high_np, low_np, close_np)
+        if atr <= 0:
+            logger.error(f"Non-positive ATR for {symbol} {timeframe} - skipping risk levels")
+            return levels
         atr_pct = (atr / entry_price) * 100
         levels.atr_current = atr
         levels.atr_pct = atr_pct
-        
+
         # === NEW: Volatility Regime Detection ===
         if self.config.enable_volatility_regime:
-            levels.volatility_regime = self._detect_volatility_regime(primary_df, atr).value
+            levels.volatility_regime = self._detect_volatility_regime(
+                high_np, low_np, close_np, atr
+            ).value
         
         # Step 1: Structure Analysis
+        # CPU-heavy detector passes run in a worker thread so they don't
+        # block the event loop while other requests are in flight
         if self.structure_detector:
-            levels.structure_analysis = self.structure_detector.analyze(primary_df)
+            levels.structure_analysis = await asyncio.to_thread(
+                self.structure_detector.analyze, primary_df
+            )
             levels.structure_quality = levels.structure_analysis.structure_score
-            
+
             # === NEW: Apply staleness penalty ===
             if self.config.enable_staleness_penalty:
                 levels.structure_quality = self._apply_staleness_penalty(
                     levels.structure_quality, levels.structure_analysis
                 )
-        
+
         # Step 2: VPVR Analysis
         if self.vpvr_analyzer:
-            levels.vpvr_analysis = self.vpvr_analyzer.analyze(primary_df, direction=direction)
+            levels.vpvr_analysis = await asyncio.to_thread(
+                self.vpvr_analyzer.analyze, primary_df, direction=direction
+            )
             levels.volume_profile_score = levels.vpvr_analysis.volume_score
         
         # Step 3: Order Flow Analysis
@@ -954,18 +1090,20 @@ class RiskEngine:
         
         # Step 4: MTF Analysis
         if self.mtf_analyzer and len(ohlcv_data) > 1:
-            levels.mtf_analysis = self.mtf_analyzer.analyze(ohlcv_data, proposed_direction=direction)
+            levels.mtf_analysis = await asyncio.to_thread(
+                self.mtf_analyzer.analyze, ohlcv_data, proposed_direction=direction
+            )
             levels.mtf_alignment = levels.mtf_analysis.alignment_score
         
-        # Step 5: Calculate Stops
-        levels.stops = self._calculate_stops(levels, primary_df, atr)
-        
-        # Step 6: Calculate Targets
-        levels.targets = self._calculate_targets(levels, primary_df, atr)
+        # Step 5 & 6: Calculate Stops and Targets (direction resolved once)
+        levels.stops = self._stops_by_dir[direction](levels, primary_df, atr)
+        levels.targets = self._targets_by_dir[direction](levels, primary_df, atr)
         
         # Step 7: Guarding Line (for swing timeframes)
         if self.config.enable_guarding_line and self._is_swing_timeframe(timeframe):
-            price_data = primary_df['low'].tolist() if direction == "long" else primary_df['high'].tolist()
+            # Reuse the hoisted arrays - no need to box 200 floats into a
+            # Python list just to scan for swing points
+            price_data = low_np if direction == "long" else high_np
             levels.guarding_line = self.guarding_manager.calculate_initial_line(
                 entry_price, direction, price_data
             )
@@ -984,14 +1122,13 @@ class RiskEngine:
             account_balance, adjusted_risk_pct, entry_price, risk_distance, atr_pct
         )
         
-        # Step 9: Risk Metrics
+        # Step 9: Risk Metrics - both ratios share one risk computation
+        # (inlined; _calculate_rr_ratio stays for external callers)
         if levels.stops and levels.targets:
-            levels.risk_reward_ratio = self._calculate_rr_ratio(
-                entry_price, levels.stops[0]['price'], levels.targets[0]['price']
-            )
-            levels.max_risk_reward_ratio = self._calculate_rr_ratio(
-                entry_price, levels.stops[0]['price'], levels.targets[-1]['price']
-            )
+            risk = _fabs(entry_price - levels.stops[0]['price'])
+            if risk > 0:
+                levels.risk_reward_ratio = _fabs(levels.targets[0]['price'] - entry_price) / risk
+                levels.max_risk_reward_ratio = _fabs(levels.targets[-1]['price'] - entry_price) / risk
         
         # === NEW: Calculate breakeven and 1R prices ===
         if levels.stops:
@@ -1012,17 +1149,19 @@ class RiskEngine:
         
         return levels
     
-    def _detect_volatility_regime(self, ohlcv: pd.DataFrame, current_atr: float) -> VolatilityRegime:
+    def _detect_volatility_regime(
+        self, high: np.ndarray, low: np.ndarray, close: np.ndarray, current_atr: float
+    ) -> VolatilityRegime:
         """
         Detect current volatility regime by comparing current ATR to historical.
-        
+
         Returns regime for position sizing adjustment.
         """
-        if len(ohlcv) < self.config.volatility_lookback:
+        if len(close) < self.config.volatility_lookback:
             return VolatilityRegime.NORMAL
-        
+
         # Calculate baseline ATR (longer period)
-        baseline_atr = self._calculate_atr(ohlcv, period=self.config.volatility_lookback)
+        baseline_atr = self._calculate_atr(high, low, close, period=self.config.volatility_lookback)
         
         if baseline_atr == 0:
             return VolatilityRegime.NORMAL
@@ -1157,27 +1296,29 @@ class RiskEngine:
         - Momentum Trailing TP (aggressive slope-based trailing)
         - Divergence detection
         """
+        # Bind the level lists directly - this method never appends to or
+        # removes from them (the breakeven path rewrites stop dicts in
+        # place, which the old shallow copies shared anyway)
         result = RiskUpdate(
-            updated_stops=list(levels.stops),
-            updated_targets=list(levels.targets),
+            updated_stops=levels.stops,
+            updated_targets=levels.targets,
         )
         
         direction = levels.direction
         entry = levels.entry_price
         current = update.current_price
-        
+        # Resolve the direction string to a sign once; the per-bar checks
+        # below use arithmetic instead of repeated string compares
+        sign = 1.0 if direction == "long" else -1.0
+
         # Use session_id or symbol as key for momentum state
         momentum_key = session_id or levels.symbol
-        
+
         # === Calculate current R-multiple ===
         if levels.stops:
             risk_distance = abs(entry - levels.stops[0]['price'])
             if risk_distance > 0:
-                if direction == "long":
-                    profit_distance = current - entry
-                else:
-                    profit_distance = entry - current
-                result.current_r_multiple = profit_distance / risk_distance
+                result.current_r_multiple = sign * (current - entry) / risk_distance
         
         # === Breakeven Stop at +1R ===
         if self.config.enable_breakeven_stop and result.current_r_multiple >= self.config.breakeven_trigger_r:
@@ -1209,15 +1350,14 @@ class RiskEngine:
             momentum_state = self._momentum_states[momentum_key]
             
             # Prepare candle data for momentum TP
-            recent_closes = ohlcv['close'].tolist()[-10:]
+            recent_closes = ohlcv['close'].to_numpy()[-10:]
+            tail = ohlcv.iloc[-5:]
             recent_candles = [
-                {
-                    'open': float(row['open']),
-                    'high': float(row['high']),
-                    'low': float(row['low']),
-                    'close': float(row['close']),
-                }
-                for _, row in ohlcv.tail(5).iterrows()
+                {'open': o, 'high': h, 'low': l, 'close': c}
+                for o, h, l, c in zip(
+                    tail['open'].to_numpy(), tail['high'].to_numpy(),
+                    tail['low'].to_numpy(), tail['close'].to_numpy()
+                )
             ]
             
             # Update momentum trailing
@@ -1261,7 +1401,12 @@ class RiskEngine:
                 result.exit_reason = exit_reason
                 result.exit_percentage = 100.0  # Full exit on momentum break
                 result.alerts.append(f"🎯 MOMENTUM EXIT: {exit_reason}")
-        
+
+        # Resolve the momentum state once for the checks below instead of
+        # re-fetching it from the dict at each use site
+        momentum_state = self._momentum_states.get(momentum_key)
+        momentum_active = bool(momentum_state and momentum_state.active)
+
         # === Divergence Detection ===
         if ohlcv is not None and self.config.enable_divergence_detection:
             div_detected, div_type = self._detect_divergence(ohlcv, direction)
@@ -1275,28 +1420,26 @@ class RiskEngine:
                     result.alerts.append(f"⚠️ {div_type.upper()} divergence detected - consider partial exit")
                     
                     # Only signal exit if we're in profit and momentum trailing not active
-                    momentum_state = self._momentum_states.get(momentum_key)
-                    if result.current_r_multiple > 0.5 and (not momentum_state or not momentum_state.active):
+                    if result.current_r_multiple > 0.5 and not momentum_active:
                         result.exit_signal = True
                         result.exit_reason = f"{div_type} divergence - momentum weakening"
                         result.exit_percentage = 33.0  # Partial exit
         
         # Check fixed targets hit (only if momentum trailing not active)
-        momentum_state = self._momentum_states.get(momentum_key)
-        if not (momentum_state and momentum_state.active):
-            for target in levels.targets:
-                if direction == "long" and current >= target['price']:
-                    result.exit_signal = True
-                    result.exit_reason = f"Target hit: {target['reason']}"
-                    result.exit_percentage = target.get('exit_percentage', 100)
-                    result.alerts.append(f"🎯 TARGET HIT at ${target['price']:,.2f}")
-                    break
-                elif direction == "short" and current <= target['price']:
-                    result.exit_signal = True
-                    result.exit_reason = f"Target hit: {target['reason']}"
-                    result.exit_percentage = target.get('exit_percentage', 100)
-                    result.alerts.append(f"🎯 TARGET HIT at ${target['price']:,.2f}")
-                    break
+        if levels.targets and not momentum_active:
+            # One C-level comparison across all targets instead of a
+            # per-target Python loop with a direction branch inside it
+            target_prices = np.fromiter(
+                (t['price'] for t in levels.targets), dtype=np.float64,
+                count=len(levels.targets),
+            )
+            hits = sign * (current - target_prices) >= 0
+            if hits.any():
+                target = levels.targets[int(np.argmax(hits))]
+                result.exit_signal = True
+                result.exit_reason = f"Target hit: {target['reason']}"
+                result.exit_percentage = target.get('exit_percentage', 100)
+                result.alerts.append(f"🎯 TARGET HIT at ${target['price']:,.2f}")
         
         # Check guarding line
         if levels.guarding_line and update.bars_since_entry >= self.config.guarding_activation_bars:
@@ -1334,6 +1477,26 @@ class RiskEngine:
         
         return result
     
+    def update_positions_batch(
+        self,
+        positions: List[Tuple[RiskLevels, PositionUpdate, Optional[pd.DataFrame], Optional[str]]],
+    ) -> List[RiskUpdate]:
+        """
+        Update many open positions in one call.
+
+        The engine is stateless per position (sessions own their state),
+        so each position still runs the full per-position logic - the
+        momentum trailing, divergence and guarding paths are inherently
+        scalar. Batching here amortizes call overhead for portfolio-wide
+        per-bar sweeps; callers pass (levels, update, ohlcv, session_id)
+        tuples in the same shape update_position takes.
+        """
+        update_one = self.update_position
+        return [
+            update_one(levels, update, ohlcv=ohlcv, session_id=session_id)
+            for levels, update, ohlcv, session_id in positions
+        ]
+
     def get_momentum_state(self, session_id: str) -> Optional[Dict]:
         """Get current momentum trailing state for a session."""
         state = self._momentum_states.get(session_id)
@@ -1386,135 +1549,175 @@ class RiskEngine:
         return "neutral"
     
     def _calculate_stops(self, levels: RiskLevels, ohlcv: pd.DataFrame, atr: float) -> List[Dict[str, Any]]:
-        """Calculate stops using structural levels."""
+        """Calculate stops using structural levels (dispatched by direction)."""
+        return self._stops_by_dir[levels.direction](levels, ohlcv, atr)
+
+    def _calculate_stops_long(self, levels: RiskLevels, ohlcv: pd.DataFrame, atr: float) -> List[Dict[str, Any]]:
+        """Long-side stops: structural support below entry, ATR tiers below."""
         stops = []
         entry = levels.entry_price
-        direction = levels.direction
-        
-        if direction == "long":
-            # Use structure for support
-            if levels.structure_analysis and levels.structure_analysis.best_support:
-                support_price = levels.structure_analysis.best_support.price
-                if support_price < entry:
-                    stop_price = support_price - (atr * 0.2)
-                    distance_pct = ((entry - stop_price) / entry) * 100
-                    
-                    if distance_pct <= self.config.max_stop_pct:
-                        stops.append({
-                            'price': stop_price,
-                            'type': 'structural',
-                            'reason': f"Below structural support at {support_price:.2f}",
-                            'confidence': levels.structure_analysis.best_support.confluence_score / 10,
-                            'distance_pct': distance_pct,
-                        })
-            
-            # Fallback: ATR-based
-            if not stops:
-                stop_price = entry - (atr * self.config.atr_stop_multiplier)
-                distance_pct = ((entry - stop_price) / entry) * 100
-                stops.append({
-                    'price': stop_price,
-                    'type': 'atr',
-                    'reason': f"{self.config.atr_stop_multiplier}x ATR stop",
-                    'confidence': 0.6,
-                    'distance_pct': distance_pct,
-                })
-            
-            # Multi-tier stops
-            if self.config.enable_multi_tier_stops:
-                stops.append({
-                    'price': entry - (atr * self.config.atr_stop_multiplier * 1.5),
-                    'type': 'secondary',
-                    'reason': "Secondary stop (wider protection)",
-                    'confidence': 0.5,
-                    'distance_pct': (atr * self.config.atr_stop_multiplier * 1.5 / entry) * 100,
-                })
-                stops.append({
-                    'price': entry * (1 - self.config.max_stop_pct / 100),
-                    'type': 'safety_net',
-                    'reason': f"Maximum {self.config.max_stop_pct}% loss protection",
-                    'confidence': 1.0,
-                    'distance_pct': self.config.max_stop_pct,
-                })
-        
-        else:  # short
-            if levels.structure_analysis and levels.structure_analysis.best_resistance:
-                resistance_price = levels.structure_analysis.best_resistance.price
-                if resistance_price > entry:
-                    stop_price = resistance_price + (atr * 0.2)
-                    distance_pct = ((stop_price - entry) / entry) * 100
-                    
-                    if distance_pct <= self.config.max_stop_pct:
-                        stops.append({
-                            'price': stop_price,
-                            'type': 'structural',
-                            'reason': f"Above structural resistance at {resistance_price:.2f}",
-                            'confidence': levels.structure_analysis.best_resistance.confluence_score / 10,
-                            'distance_pct': distance_pct,
-                        })
-            
-            if not stops:
-                stop_price = entry + (atr * self.config.atr_stop_multiplier)
-                distance_pct = ((stop_price - entry) / entry) * 100
-                stops.append({
-                    'price': stop_price,
-                    'type': 'atr',
-                    'reason': f"{self.config.atr_stop_multiplier}x ATR stop",
-                    'confidence': 0.6,
-                    'distance_pct': distance_pct,
-                })
-            
-            if self.config.enable_multi_tier_stops:
-                stops.append({
-                    'price': entry + (atr * self.config.atr_stop_multiplier * 1.5),
-                    'type': 'secondary',
-                    'reason': "Secondary stop (wider protection)",
-                    'confidence': 0.5,
-                    'distance_pct': (atr * self.config.atr_stop_multiplier * 1.5 / entry) * 100,
-                })
-                stops.append({
-                    'price': entry * (1 + self.config.max_stop_pct / 100),
-                    'type': 'safety_net',
-                    'reason': f"Maximum {self.config.max_stop_pct}% loss protection",
-                    'confidence': 1.0,
-                    'distance_pct': self.config.max_stop_pct,
-                })
-        
+        # Rebind cached config constants as locals (LOAD_FAST on hot path)
+        mult = self._atr_mult
+        mult_secondary = self._atr_mult_secondary
+        max_stop_pct = self._max_stop_pct
+        # One division up front; every percent conversion below is a multiply
+        inv_entry_100 = 100.0 / entry
+
+        # Use structure for support
+        if levels.structure_analysis and levels.structure_analysis.best_support:
+            support_price = levels.structure_analysis.best_support.price
+            if support_price < entry:
+                stop_price = support_price - (atr * 0.2)
+                distance_pct = (entry - stop_price) * inv_entry_100
+
+                if distance_pct <= max_stop_pct:
+                    stops.append({
+                        'price': stop_price,
+                        'type': 'structural',
+                        'reason': f"Below structural support at {support_price:.2f}",
+                        'confidence': levels.structure_analysis.best_support.confluence_score / 10,
+                        'distance_pct': distance_pct,
+                    })
+
+        # ATR-derived tiers: one arithmetic block yields both offsets
+        offsets = np.array([mult, mult_secondary]) * atr
+        dist_pcts = offsets * inv_entry_100
+
+        # Fallback: ATR-based
+        if not stops:
+            stops.append({
+                'price': float(entry - offsets[0]),
+                'type': 'atr',
+                'reason': f"{mult}x ATR stop",
+                'confidence': 0.6,
+                'distance_pct': float(dist_pcts[0]),
+            })
+
+        # Multi-tier stops
+        if self.config.enable_multi_tier_stops:
+            stops.append({
+                'price': float(entry - offsets[1]),
+                'type': 'secondary',
+                'reason': "Secondary stop (wider protection)",
+                'confidence': 0.5,
+                'distance_pct': float(dist_pcts[1]),
+            })
+            stops.append({
+                'price': entry * (1 - self._max_stop_frac),
+                'type': 'safety_net',
+                'reason': f"Maximum {max_stop_pct}% loss protection",
+                'confidence': 1.0,
+                'distance_pct': max_stop_pct,
+            })
+
         return stops
-    
+
+    def _calculate_stops_short(self, levels: RiskLevels, ohlcv: pd.DataFrame, atr: float) -> List[Dict[str, Any]]:
+        """Short-side stops: structural resistance above entry, ATR tiers above."""
+        stops = []
+        entry = levels.entry_price
+        mult = self._atr_mult
+        mult_secondary = self._atr_mult_secondary
+        max_stop_pct = self._max_stop_pct
+        inv_entry_100 = 100.0 / entry
+
+        if levels.structure_analysis and levels.structure_analysis.best_resistance:
+            resistance_price = levels.structure_analysis.best_resistance.price
+            if resistance_price > entry:
+                stop_price = resistance_price + (atr * 0.2)
+                distance_pct = (stop_price - entry) * inv_entry_100
+
+                if distance_pct <= max_stop_pct:
+                    stops.append({
+                        'price': stop_price,
+                        'type': 'structural',
+                        'reason': f"Above structural resistance at {resistance_price:.2f}",
+                        'confidence': levels.structure_analysis.best_resistance.confluence_score / 10,
+                        'distance_pct': distance_pct,
+                    })
+
+        offsets = np.array([mult, mult_secondary]) * atr
+        dist_pcts = offsets * inv_entry_100
+
+        if not stops:
+            stops.append({
+                'price': float(entry + offsets[0]),
+                'type': 'atr',
+                'reason': f"{mult}x ATR stop",
+                'confidence': 0.6,
+                'distance_pct': float(dist_pcts[0]),
+            })
+
+        if self.config.enable_multi_tier_stops:
+            stops.append({
+                'price': float(entry + offsets[1]),
+                'type': 'secondary',
+                'reason': "Secondary stop (wider protection)",
+                'confidence': 0.5,
+                'distance_pct': float(dist_pcts[1]),
+            })
+            stops.append({
+                'price': entry * (1 + self._max_stop_frac),
+                'type': 'safety_net',
+                'reason': f"Maximum {max_stop_pct}% loss protection",
+                'confidence': 1.0,
+                'distance_pct': max_stop_pct,
+            })
+
+        return stops
+
     def _calculate_targets(self, levels: RiskLevels, ohlcv: pd.DataFrame, atr: float) -> List[Dict[str, Any]]:
-        """Calculate targets using structural levels + VPVR."""
+        """Calculate targets using structural levels + VPVR (dispatched by direction)."""
+        return self._targets_by_dir[levels.direction](levels, ohlcv, atr)
+
+    def _calculate_targets_long(self, levels: RiskLevels, ohlcv: pd.DataFrame, atr: float) -> List[Dict[str, Any]]:
+        """Long-side targets: structural resistance above entry."""
+        structural_targets = []
+        if levels.structure_analysis and levels.structure_analysis.best_resistance:
+            resist_price = levels.structure_analysis.best_resistance.price
+            if resist_price > levels.entry_price:
+                structural_targets.append((resist_price, "Structural resistance", "structural"))
+        return self._assemble_targets(levels, atr, structural_targets, dir_sign=1.0)
+
+    def _calculate_targets_short(self, levels: RiskLevels, ohlcv: pd.DataFrame, atr: float) -> List[Dict[str, Any]]:
+        """Short-side targets: structural support below entry."""
+        structural_targets = []
+        if levels.structure_analysis and levels.structure_analysis.best_support:
+            support_price = levels.structure_analysis.best_support.price
+            if support_price < levels.entry_price:
+                structural_targets.append((support_price, "Structural support", "structural"))
+        return self._assemble_targets(levels, atr, structural_targets, dir_sign=-1.0)
+
+    def _assemble_targets(
+        self, levels: RiskLevels, atr: float,
+        structural_targets: List[Tuple[float, str, str]], dir_sign: float
+    ) -> List[Dict[str, Any]]:
+        """Combine VPVR + structural targets, with R-multiple fallback."""
         targets = []
         entry = levels.entry_price
-        direction = levels.direction
-        exit_ratios = self.config.partial_exit_ratios
-        
+        exit_ratios = self._exit_ratios
+        inv_entry_100 = 100.0 / entry
+
         # VPVR targets (HVN mountains)
         vpvr_targets = []
         if levels.vpvr_analysis and self.vpvr_analyzer:
-            vpvr_targets = self.vpvr_analyzer.get_targets(levels.vpvr_analysis, direction, entry)
-        
-        # Structural targets
-        structural_targets = []
-        if levels.structure_analysis:
-            if direction == "long" and levels.structure_analysis.best_resistance:
-                resist_price = levels.structure_analysis.best_resistance.price
-                if resist_price > entry:
-                    structural_targets.append((resist_price, "Structural resistance", "structural"))
-            elif direction == "short" and levels.structure_analysis.best_support:
-                support_price = levels.structure_analysis.best_support.price
-                if support_price < entry:
-                    structural_targets.append((support_price, "Structural support", "structural"))
-        
-        # Combine and sort
+            vpvr_targets = self.vpvr_analyzer.get_targets(levels.vpvr_analysis, levels.direction, entry)
+
+        # Combine, then pick the nearest candidates with one C-level
+        # argsort over the price array instead of a keyed Python sort
         all_targets = [(p, r, "vpvr") for p, r in vpvr_targets] + structural_targets
-        all_targets.sort(key=lambda t: abs(t[0] - entry))
-        
+        if all_targets:
+            prices = np.fromiter(
+                (t[0] for t in all_targets), dtype=np.float64, count=len(all_targets)
+            )
+            order = np.argsort(np.abs(prices - entry), kind="stable")[:3]
+            all_targets = [all_targets[i] for i in order]
+
         # Create target levels
-        for i, (target_price, reason, ttype) in enumerate(all_targets[:3]):
+        for i, (target_price, reason, ttype) in enumerate(all_targets):
             exit_pct = exit_ratios[i] if i < len(exit_ratios) else exit_ratios[-1]
-            distance_pct = abs((target_price - entry) / entry) * 100
-            
+            distance_pct = abs(target_price - entry) * inv_entry_100
+
             targets.append({
                 'price': target_price,
                 'type': ttype,
@@ -1523,23 +1726,26 @@ class RiskEngine:
                 'distance_pct': distance_pct,
                 'confidence': 0.75,
             })
-        
-        # Fallback: R multiples
+
+        # Fallback: R multiples - all three extensions in one arithmetic block
         if not targets:
-            stop_distance = atr * self.config.atr_stop_multiplier
-            for i, multiple in enumerate([2.0, 3.0, 5.0]):
-                target_price = entry + (stop_distance * multiple) if direction == "long" else entry - (stop_distance * multiple)
+            stop_distance = atr * self._atr_mult
+            multiples = (2.0, 3.0, 5.0)
+            offsets = np.array(multiples) * stop_distance
+            prices = entry + dir_sign * offsets
+            dist_pcts = offsets * inv_entry_100
+
+            for i, multiple in enumerate(multiples):
                 exit_pct = exit_ratios[i] if i < len(exit_ratios) else exit_ratios[-1]
-                
                 targets.append({
-                    'price': target_price,
+                    'price': float(prices[i]),
                     'type': 'extension',
                     'reason': f"{multiple}R target",
                     'exit_percentage': exit_pct * 100,
-                    'distance_pct': abs((target_price - entry) / entry) * 100,
+                    'distance_pct': float(dist_pcts[i]),
                     'confidence': 0.5,
                 })
-        
+
         return targets
     
     def _calculate_position_size(
@@ -1561,27 +1767,32 @@ class RiskEngine:
     
     def _calculate_rr_ratio(self, entry: float, stop: float, target: float) -> float:
         """Calculate risk:reward ratio."""
-        risk = abs(entry - stop)
-        reward = abs(target - entry)
-        return reward / risk if risk > 0 else 0.0
+        risk = _fabs(entry - stop)
+        return _fabs(target - entry) / risk if risk > 0 else 0.0
     
-    def _calculate_atr(self, ohlcv: pd.DataFrame, period: int = 14) -> float:
-        """Calculate Average True Range."""
-        high = ohlcv['high'].values
-        low = ohlcv['low'].values
-        close = ohlcv['close'].values
-        
+    def _calculate_atr(
+        self, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14
+    ) -> float:
+        """Calculate Average True Range from pre-extracted numpy arrays."""
+        if NUMBA_AVAILABLE:
+            # Single native loop over the trailing window - no temporaries
+            return atr_core(
+                np.ascontiguousarray(high, dtype=np.float64),
+                np.ascontiguousarray(low, dtype=np.float64),
+                np.ascontiguousarray(close, dtype=np.float64),
+                period,
+            )
+
         tr = np.maximum(
             high[1:] - low[1:],
             np.maximum(np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1]))
         )
-        
+
         return float(np.mean(tr[-period:]) if len(tr) >= period else np.mean(tr))
     
     def _is_swing_timeframe(self, timeframe: str) -> bool:
         """Check if timeframe is suitable for swing trading."""
-        swing_timeframes = {"4h", "1d", "1w", "4H", "1D", "1W", "daily", "weekly"}
-        return timeframe.lower() in {tf.lower() for tf in swing_timeframes}
+        return timeframe.lower() in _SWING_TFS
     
     def _trail_stop(
         self, direction: str, entry: float, current: float,
@@ -1590,23 +1801,18 @@ class RiskEngine:
         """Calculate trailed stop price."""
         if not stops:
             return None
-        
+
         primary = stops[0]
-        primary_distance = primary.get('distance_pct', 2.0)
-        
-        if direction == "long":
-            profit_pct = (current - entry) / entry * 100
-            if profit_pct >= primary_distance:
-                new_stop = entry * 1.001
-                if new_stop > primary['price']:
-                    return new_stop
-        else:
-            profit_pct = (entry - current) / entry * 100
-            if profit_pct >= primary_distance:
-                new_stop = entry * 0.999
-                if new_stop < primary['price']:
-                    return new_stop
-        
+
+        # Single signed comparison instead of mirrored if/else blocks
+        sign = 1.0 if direction == "long" else -1.0
+        profit_pct = sign * (current - entry) * (100.0 / entry)
+        if profit_pct < primary.get('distance_pct', 2.0):
+            return None
+
+        new_stop = entry * (self._trail_lock_long if sign > 0 else self._trail_lock_short)
+        if sign * (new_stop - primary['price']) > 0:
+            return new_stop
         return None
     
     def _check_structure_health(
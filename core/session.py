@@ -22,6 +22,7 @@ Exit Priority:
 5. Volume climax → take profits
 """
 
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
@@ -32,6 +33,7 @@ import logging
 
 from .risk_engine import GuardingLineManager, StructureHealth, VolatilityRegime
 from .adaptive_budget import AdaptiveRiskBudget, TradeBudget, Shot, ShotStatus
+from ._update_kernel import update_pnl_core
 
 logger = logging.getLogger(__name__)
 
@@ -177,9 +179,30 @@ class SessionState:
     # Alerts/signals
     pending_signals: List[Dict] = field(default_factory=list)
     last_update: datetime = field(default_factory=datetime.utcnow)
-    
+
+    # Memoized to_dict() payload - rebuilt only after a mutation. GET
+    # endpoints poll unchanged sessions far more often than they change.
+    _cached_dict: Optional[Dict] = field(default=None, repr=False, compare=False)
+    _dirty: bool = field(default=True, repr=False, compare=False)
+
+    # Monotonic mutation counter - caches keyed on it (summary, responses)
+    # invalidate automatically whenever the session changes
+    _version: int = field(default=0, repr=False, compare=False)
+    _summary_cache: Optional[Dict] = field(default=None, repr=False, compare=False)
+    _summary_version: int = field(default=-1, repr=False, compare=False)
+    _ui_extras_cache: Optional[Dict] = field(default=None, repr=False, compare=False)
+    _ui_extras_version: int = field(default=-1, repr=False, compare=False)
+
+    def mark_dirty(self) -> None:
+        """Invalidate cached payloads after a mutation."""
+        self._dirty = True
+        self._version += 1
+
     def to_dict(self) -> Dict:
-        return {
+        if not self._dirty and self._cached_dict is not None:
+            return self._cached_dict
+
+        result = {
             'id': self.id,
             'symbol': self.symbol,
             'direction': self.direction,
@@ -261,6 +284,34 @@ class SessionState:
             'last_update': self.last_update.isoformat(),
         }
 
+        self._cached_dict = result
+        self._dirty = False
+        return result
+
+    def ui_extras(self) -> Dict:
+        """Flat UI-friendly fields layered over to_dict() by /state."""
+        if self._ui_extras_version == self._version and self._ui_extras_cache is not None:
+            return self._ui_extras_cache
+
+        extras = {
+            'entry_price': self.average_entry,
+            'position_size': self.total_size,
+            'risk_amount': self.risk_used,
+            'total_risk_budget': self.account_balance * (self.total_risk_cap_pct / 100),
+            'bars_in_trade': self.bars_in_trade,
+            'avg_entry': self.average_entry,
+            'total_size': self.total_size,
+            'unrealized_pnl': self.unrealized_pnl,
+            'unrealized_pnl_pct': self.unrealized_pnl_pct,
+            'realized_pnl': self.realized_pnl,
+            'current_price': self.current_price,
+            'guarding_line': self.guarding_level,
+        }
+
+        self._ui_extras_cache = extras
+        self._ui_extras_version = self._version
+        return extras
+
 
 @dataclass
 class SessionUpdate:
@@ -294,6 +345,14 @@ class SessionUpdate:
     # Alerts
     alerts: List[str] = field(default_factory=list)
 
+    def to_dict(self) -> Dict:
+        """Response-shaped dict: copy __dict__ and unwrap the enums."""
+        d = self.__dict__.copy()
+        d['status'] = self.status.value
+        d['phase'] = self.phase.value
+        d['exit_reason'] = self.exit_reason.value if self.exit_reason else None
+        return d
+
 
 # =============================================================================
 # SESSION MANAGER
@@ -352,6 +411,12 @@ class SessionManager:
         
         # Active sessions
         self._sessions: Dict[str, SessionState] = {}
+        # Secondary index: symbol -> session ids, so per-symbol listing
+        # doesn't walk every session ever created
+        self._by_symbol: Dict[str, set] = defaultdict(set)
+        # Ids of sessions with an open position, maintained on status
+        # transitions so "list active" never scans closed history
+        self._active_ids: set = set()
         
         # Budget manager for multi-shot
         self._budget_manager = AdaptiveRiskBudget(
@@ -418,7 +483,8 @@ class SessionManager:
         )
         
         self._sessions[session_id] = session
-        logger.info(f"Created session {session_id} for {symbol} {direction}")
+        self._by_symbol[symbol].add(session_id)
+        logger.info("Created session %s for %s %s", session_id, symbol, direction)
         
         return session
     
@@ -440,15 +506,15 @@ class SessionManager:
         """
         session = self._sessions.get(session_id)
         if not session:
-            logger.error(f"Session {session_id} not found")
+            logger.error("Session %s not found", session_id)
             return None
         
         if session.shots_taken >= session.max_shots:
-            logger.warning(f"Session {session_id}: Max shots ({session.max_shots}) already taken")
+            logger.warning("Session %s: Max shots (%d) already taken", session_id, session.max_shots)
             return None
         
         if session.status == SessionStatus.STOPPED:
-            logger.warning(f"Session {session_id}: Already stopped out")
+            logger.warning("Session %s: Already stopped out", session_id)
             return None
         
         # Calculate shot allocation (50% → 30% → 20%)
@@ -463,7 +529,7 @@ class SessionManager:
         # Cap at remaining risk
         shot_risk = min(shot_risk, session.risk_remaining)
         if shot_risk <= 0:
-            logger.warning(f"Session {session_id}: No risk budget remaining")
+            logger.warning("Session %s: No risk budget remaining", session_id)
             return None
         
         # Calculate stop price
@@ -479,7 +545,7 @@ class SessionManager:
         # Calculate position size
         risk_distance = abs(entry_price - stop_price)
         if risk_distance <= 0:
-            logger.error(f"Session {session_id}: Invalid risk distance")
+            logger.error("Session %s: Invalid risk distance", session_id)
             return None
         
         size = shot_risk / risk_distance
@@ -527,11 +593,13 @@ class SessionManager:
         else:
             session.current_stop = min(session.current_stop, stop_price)
         
+        self._active_ids.add(session_id)
+        session.mark_dirty()
         logger.info(
-            f"Session {session_id}: Shot {shot_number} taken - "
-            f"Entry: {entry_price}, Size: {size:.4f}, Risk: ${shot_risk:.2f}"
+            "Session %s: Shot %d taken - Entry: %s, Size: %.4f, Risk: $%.2f",
+            session_id, shot_number, entry_price, size, shot_risk,
         )
-        
+
         return entry
     
     def update_session(
@@ -584,6 +652,8 @@ class SessionManager:
         # Check expiration
         if session.expires_at and datetime.utcnow() > session.expires_at:
             session.status = SessionStatus.EXPIRED
+            self._active_ids.discard(session_id)
+            session.mark_dirty()
             return SessionUpdate(
                 session_id=session_id,
                 status=SessionStatus.EXPIRED,
@@ -599,26 +669,27 @@ class SessionManager:
             )
         
         # Update tracking
+        session.mark_dirty()
         session.current_price = current_price
         session.bars_in_trade = current_bar
         session.highest_since_entry = max(session.highest_since_entry, current_price)
         session.lowest_since_entry = min(session.lowest_since_entry, current_price)
         session.last_update = datetime.utcnow()
         
-        # Calculate P&L
+        # Calculate P&L (JIT kernel when numba is available)
         if session.remaining_size > 0:
-            if session.direction == "long":
-                session.unrealized_pnl = (current_price - session.average_entry) * session.remaining_size
-            else:
-                session.unrealized_pnl = (session.average_entry - current_price) * session.remaining_size
-            
-            session.unrealized_pnl_pct = (session.unrealized_pnl / session.account_balance) * 100
-            
-            # === NEW: Calculate R-multiple ===
-            risk_distance = abs(session.average_entry - session.structural_stop)
-            if risk_distance > 0:
-                profit_distance = (current_price - session.average_entry) if session.direction == "long" else (session.average_entry - current_price)
-                session.current_r_multiple = profit_distance / risk_distance
+            pnl, pnl_pct, r_multiple = update_pnl_core(
+                current_price,
+                session.average_entry,
+                session.remaining_size,
+                session.account_balance,
+                session.structural_stop,
+                session.direction == "long",
+            )
+            session.unrealized_pnl = pnl
+            session.unrealized_pnl_pct = pnl_pct
+            if session.average_entry != session.structural_stop:
+                session.current_r_multiple = r_multiple
         
         alerts = []
         update = SessionUpdate(
@@ -674,12 +745,14 @@ class SessionManager:
             session.phase = TradePhase.PHASE_2
             session.status = SessionStatus.PHASE_2
             
-            # Initialize guarding line
-            if recent_lows and session.direction == "long":
+            # Initialize guarding line. Length checks rather than bare
+            # truthiness so callers can pass numpy arrays without copying
+            # to lists.
+            if recent_lows is not None and len(recent_lows) and session.direction == "long":
                 session.guarding_line = self._guarding_manager.calculate_initial_line(
                     session.average_entry, session.direction, recent_lows
                 )
-            elif recent_highs and session.direction == "short":
+            elif recent_highs is not None and len(recent_highs) and session.direction == "short":
                 session.guarding_line = self._guarding_manager.calculate_initial_line(
                     session.average_entry, session.direction, recent_highs
                 )
@@ -815,7 +888,7 @@ class SessionManager:
             return None
         
         if session.remaining_size <= 0:
-            logger.warning(f"Session {session_id}: No remaining position to exit")
+            logger.warning("Session %s: No remaining position to exit", session_id)
             return None
         
         # Calculate exit size
@@ -863,33 +936,47 @@ class SessionManager:
         if session.remaining_size <= 0.0001:  # Fully closed
             session.status = SessionStatus.CLOSED
             session.remaining_size = 0
+            self._active_ids.discard(session_id)
         elif exit_reason in [ExitReason.STRUCTURE_BROKEN, ExitReason.SAFETY_NET, ExitReason.GUARDING_BROKEN]:
             session.status = SessionStatus.STOPPED
+            self._active_ids.discard(session_id)
         else:
             session.status = SessionStatus.PARTIAL_EXIT
         
+        session.mark_dirty()
         logger.info(
-            f"Session {session_id}: Exited {exit_pct*100:.0f}% at ${exit_price:,.2f} "
-            f"({exit_reason.value}) - P&L: ${pnl:,.2f}"
+            "Session %s: Exited %.0f%% at $%s (%s) - P&L: $%.2f",
+            session_id, exit_pct * 100, f"{exit_price:,.2f}", exit_reason.value, pnl,
         )
-        
+
         return partial
     
     def get_session(self, session_id: str) -> Optional[SessionState]:
         """Get session by ID."""
         return self._sessions.get(session_id)
     
+    def get_sessions_for_symbol(self, symbol: str) -> List[SessionState]:
+        """Get all sessions for a symbol via the symbol index (any status)."""
+        return [self._sessions[sid] for sid in self._by_symbol.get(symbol, ())]
+
+    def iter_active(self, symbol: str = None):
+        """Iterate active sessions without materializing a list."""
+        if symbol:
+            ids = self._by_symbol.get(symbol, set()) & self._active_ids
+        else:
+            ids = tuple(self._active_ids)
+
+        for sid in ids:
+            yield self._sessions[sid]
+
     def get_active_sessions(self, symbol: str = None) -> List[SessionState]:
         """Get all active sessions, optionally filtered by symbol."""
-        active = [
-            s for s in self._sessions.values()
-            if s.status in [SessionStatus.ACTIVE, SessionStatus.PHASE_1, SessionStatus.PHASE_2, SessionStatus.PARTIAL_EXIT]
-        ]
-        
         if symbol:
-            active = [s for s in active if s.symbol == symbol]
-        
-        return active
+            ids = self._by_symbol.get(symbol, set()) & self._active_ids
+        else:
+            ids = self._active_ids
+
+        return [self._sessions[sid] for sid in ids]
     
     def close_session(self, session_id: str, reason: str = "manual") -> bool:
         """Close a session without exiting (e.g., on expiration)."""
@@ -898,19 +985,24 @@ class SessionManager:
             return False
         
         session.status = SessionStatus.CLOSED
-        logger.info(f"Session {session_id} closed: {reason}")
+        self._active_ids.discard(session_id)
+        session.mark_dirty()
+        logger.info("Session %s closed: %s", session_id, reason)
         return True
     
     def get_session_summary(self, session_id: str) -> Dict:
-        """Get a summary of session performance."""
+        """Get a summary of session performance (cached per session version)."""
         session = self._sessions.get(session_id)
         if not session:
             return {}
-        
+
+        if session._summary_version == session._version and session._summary_cache is not None:
+            return session._summary_cache
+
         total_pnl = session.realized_pnl + session.unrealized_pnl
         total_pnl_pct = (total_pnl / session.account_balance) * 100
         
-        return {
+        summary = {
             'session_id': session_id,
             'symbol': session.symbol,
             'direction': session.direction,
@@ -930,3 +1022,7 @@ class SessionManager:
             'partial_exits': len(session.partial_exits),
         }
 
+        session._summary_cache = summary
+        session._summary_version = session._version
+        return summary
+
@@ -18,11 +18,14 @@ Date: January 2026
 
 import numpy as np
 import pandas as pd
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 import logging
 
+from ._update_kernel import NUMBA_AVAILABLE, fractal_swing_scan
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,6 +51,12 @@ class StructureGrade(int, Enum):
     GRADE_4 = 4       # 4+ touches OR bipolar status
 
 
+# Hoisted membership sets for the hot support/resistance classification
+# (a list literal here would be rebuilt on every pressure point)
+_SUPPORT_SIDE = frozenset((TrendlineType.SUPPORT, TrendlineType.BIPOLAR))
+_RESISTANCE_SIDE = frozenset((TrendlineType.RESISTANCE, TrendlineType.BIPOLAR))
+
+
 @dataclass
 class SwingPoint:
     """A validated swing high or low."""
@@ -351,66 +360,67 @@ class StructureDetector:
         - It's higher than N bars to the right
         
         This is different from "N-bar high" which just looks left.
+
+        The fractal comparisons and strength filter run as NumPy boolean
+        masks over a sliding window, so the scan stays in C instead of a
+        per-bar Python loop.
         """
-        swings = []
         lookback = self.swing_lookback
-        
+        window = 2 * lookback + 1
+        arr = high if swing_type == SwingType.HIGH else low
+        limit = current_bar + 1
+
         # Need enough bars on both sides
-        for i in range(lookback, current_bar - lookback + 1):
+        if limit < window:
+            return []
+
+        if NUMBA_AVAILABLE:
+            # JIT-compiled native loop: no per-bar Python dispatch at all
+            indices, strengths = fractal_swing_scan(
+                np.ascontiguousarray(arr[:limit], dtype=np.float64),
+                lookback, current_bar, swing_type == SwingType.HIGH,
+            )
+        else:
+            # Vectorized NumPy fallback: row k holds bars [k, k + window);
+            # its center is bar k + lookback
+            windows = np.lib.stride_tricks.sliding_window_view(arr[:limit], window)
+            centers = windows[:, lookback]
+            left = windows[:, :lookback]
+            right = windows[:, lookback + 1:]
+
             if swing_type == SwingType.HIGH:
-                price = high[i]
-                
-                # Check left side
-                left_valid = all(high[i] > high[i-j] for j in range(1, lookback + 1))
-                
-                # Check right side
-                right_valid = all(high[i] >= high[i+j] for j in range(1, lookback + 1))
-                
-                if left_valid and right_valid:
-                    # Calculate strength based on how much higher than surrounding
-                    surrounding = np.concatenate([
-                        high[i-lookback:i],
-                        high[i+1:i+lookback+1]
-                    ])
-                    strength = (price - np.mean(surrounding)) / np.std(surrounding + 1e-10)
-                    strength = min(1.0, max(0.0, strength / 3))  # Normalize to 0-1
-                    
-                    if strength >= self.min_swing_strength:
-                        swings.append(SwingPoint(
-                            index=i,
-                            price=price,
-                            swing_type=swing_type,
-                            left_bars=lookback,
-                            right_bars=lookback,
-                            strength=strength,
-                            bars_since_formation=current_bar - i,
-                        ))
-            
-            else:  # SwingType.LOW
-                price = low[i]
-                
-                left_valid = all(low[i] < low[i-j] for j in range(1, lookback + 1))
-                right_valid = all(low[i] <= low[i+j] for j in range(1, lookback + 1))
-                
-                if left_valid and right_valid:
-                    surrounding = np.concatenate([
-                        low[i-lookback:i],
-                        low[i+1:i+lookback+1]
-                    ])
-                    strength = (np.mean(surrounding) - price) / np.std(surrounding + 1e-10)
-                    strength = min(1.0, max(0.0, strength / 3))
-                    
-                    if strength >= self.min_swing_strength:
-                        swings.append(SwingPoint(
-                            index=i,
-                            price=price,
-                            swing_type=swing_type,
-                            left_bars=lookback,
-                            right_bars=lookback,
-                            strength=strength,
-                            bars_since_formation=current_bar - i,
-                        ))
-        
+                mask = (centers[:, None] > left).all(axis=1) & (centers[:, None] >= right).all(axis=1)
+            else:
+                mask = (centers[:, None] < left).all(axis=1) & (centers[:, None] <= right).all(axis=1)
+
+            candidates = np.nonzero(mask)[0]
+            if candidates.size == 0:
+                return []
+
+            # Strength: how far the swing sticks out of its surrounding bars
+            surrounding = np.concatenate([left[candidates], right[candidates]], axis=1)
+            if swing_type == SwingType.HIGH:
+                raw = centers[candidates] - surrounding.mean(axis=1)
+            else:
+                raw = surrounding.mean(axis=1) - centers[candidates]
+            strengths = np.clip(raw / np.std(surrounding + 1e-10, axis=1) / 3, 0.0, 1.0)
+            indices = candidates + lookback
+
+        swings = []
+        for i, strength in zip(indices, strengths):
+            if strength < self.min_swing_strength:
+                continue
+            i = int(i)
+            swings.append(SwingPoint(
+                index=i,
+                price=float(arr[i]),
+                swing_type=swing_type,
+                left_bars=lookback,
+                right_bars=lookback,
+                strength=float(strength),
+                bars_since_formation=current_bar - i,
+            ))
+
         return swings
     
     def _construct_trendlines(
@@ -436,21 +446,28 @@ class StructureDetector:
             return []
         
         trendlines = []
-        
+
         # Sort swings by index
         swings = sorted(swings, key=lambda s: s.index)
-        
+
+        # Parallel arrays shared by every candidate pair, so the touch
+        # test per pair is one vectorized expression instead of an inner
+        # Python loop over all swings
+        swing_idx = np.array([s.index for s in swings], dtype=np.float64)
+        swing_prices = np.array([s.price for s in swings], dtype=np.float64)
+
         # Try all pairs (older point as anchor)
         for i, anchor in enumerate(swings[:-1]):
-            for secondary in swings[i+1:]:
+            for j in range(i + 1, len(swings)):
+                secondary = swings[j]
                 # Calculate line parameters
                 dx = secondary.index - anchor.index
                 if dx == 0:
                     continue
-                    
+
                 slope = (secondary.price - anchor.price) / dx
                 intercept = anchor.price - slope * anchor.index
-                
+
                 trendline = Trendline(
                     anchor_point=anchor,
                     secondary_point=secondary,
@@ -460,18 +477,15 @@ class StructureDetector:
                     touch_count=2,  # Anchor and secondary count
                 )
                 trendline.touch_points = [anchor, secondary]
-                
+
                 # Find additional touches
-                for swing in swings:
-                    if swing in [anchor, secondary]:
+                line_prices = slope * swing_idx + intercept
+                touch_mask = np.abs(swing_prices - line_prices) / line_prices < self.touch_tolerance_pct
+                for k in np.flatnonzero(touch_mask):
+                    if k == i or k == j:
                         continue
-                    
-                    line_price = trendline.get_price_at_bar(swing.index)
-                    distance_pct = abs(swing.price - line_price) / line_price
-                    
-                    if distance_pct < self.touch_tolerance_pct:
-                        trendline.touch_points.append(swing)
-                        trendline.touch_count += 1
+                    trendline.touch_points.append(swings[k])
+                    trendline.touch_count += 1
                 
                 # Validate: check if line slices through candles
                 trendline.slices_candles = self._check_line_slices_candles(
@@ -530,34 +544,34 @@ class StructureDetector:
         Valid trendline: touches wicks or candle edges
         Invalid trendline: cuts through the middle of candle bodies
         """
-        slices_count = 0
-        total_bars = 0
-        
-        for bar in range(start_bar, min(end_bar + 1, len(high))):
-            line_price = trendline.get_price_at_bar(bar)
-            
-            # Get candle body bounds
-            body_high = max(open_p[bar], close[bar])
-            body_low = min(open_p[bar], close[bar])
-            body_mid = (body_high + body_low) / 2
-            
-            # Check if line is in the middle of the body
-            if body_low < line_price < body_high:
-                # Is it in the MIDDLE of the body? (not just touching)
-                body_range = body_high - body_low
-                if body_range > 0:
-                    relative_pos = (line_price - body_low) / body_range
-                    if 0.2 < relative_pos < 0.8:  # Middle 60% of body
-                        slices_count += 1
-            
-            total_bars += 1
-        
+        end = min(end_bar + 1, len(high))
+        if end <= start_bar:
+            return False
+
+        # Evaluate the line and candle bodies over the whole window at
+        # once instead of a per-bar loop
+        bars = np.arange(start_bar, end)
+        line_prices = trendline.slope * bars + trendline.intercept
+
+        opens = open_p[start_bar:end]
+        closes = close[start_bar:end]
+        body_high = np.maximum(opens, closes)
+        body_low = np.minimum(opens, closes)
+        body_range = body_high - body_low
+
+        # Inside the body, with a real body to measure against
+        inside = (body_low < line_prices) & (line_prices < body_high)
+        inside &= body_range > 0
+
+        # Is it in the MIDDLE of the body? (not just touching)
+        relative_pos = np.where(
+            body_range > 0, (line_prices - body_low) / np.where(body_range > 0, body_range, 1.0), 0.0
+        )
+        slices = inside & (relative_pos > 0.2) & (relative_pos < 0.8)  # Middle 60% of body
+
         # Line is invalid if it slices through more than 10% of candles
-        if total_bars > 0:
-            slice_ratio = slices_count / total_bars
-            return slice_ratio > 0.10
-        
-        return False
+        slice_ratio = np.count_nonzero(slices) / len(bars)
+        return slice_ratio > 0.10
     
     def _track_bipolar_touches(
         self,
@@ -569,20 +583,26 @@ class StructureDetector:
         end_bar: int,
     ) -> None:
         """Track whether line acted as support, resistance, or both."""
-        for bar in range(start_bar, min(end_bar + 1, len(high))):
-            line_price = trendline.get_price_at_bar(bar)
-            tolerance = line_price * self.touch_tolerance_pct
-            
-            # Check support touch (price approached from above, held)
-            if abs(low[bar] - line_price) < tolerance:
-                if close[bar] > line_price:
-                    trendline.support_touches += 1
-            
-            # Check resistance touch (price approached from below, rejected)
-            if abs(high[bar] - line_price) < tolerance:
-                if close[bar] < line_price:
-                    trendline.resistance_touches += 1
-        
+        end = min(end_bar + 1, len(high))
+        if end <= start_bar:
+            return
+
+        # Evaluate the line across the whole window at once and count
+        # touches with vectorized comparisons instead of a per-bar loop
+        bars = np.arange(start_bar, end)
+        line_prices = trendline.slope * bars + trendline.intercept
+        tolerances = line_prices * self.touch_tolerance_pct
+
+        closes = close[start_bar:end]
+        # Support touch: price approached from above, held
+        trendline.support_touches += int(np.count_nonzero(
+            (np.abs(low[start_bar:end] - line_prices) < tolerances) & (closes > line_prices)
+        ))
+        # Resistance touch: price approached from below, rejected
+        trendline.resistance_touches += int(np.count_nonzero(
+            (np.abs(high[start_bar:end] - line_prices) < tolerances) & (closes < line_prices)
+        ))
+
         # Update line type if bipolar
         if trendline.is_bipolar():
             trendline.line_type = TrendlineType.BIPOLAR
@@ -595,23 +615,30 @@ class StructureDetector:
         current_bar: int,
     ) -> bool:
         """Check if line has been broken by a candle CLOSE."""
-        for bar in range(start_bar, min(current_bar + 1, len(close))):
-            line_price = trendline.get_price_at_bar(bar)
-            tolerance = line_price * self.slice_tolerance_pct
-            
-            if trendline.line_type == TrendlineType.SUPPORT:
-                # Support broken when close is decisively below
-                if close[bar] < line_price - tolerance:
-                    trendline.break_bar = bar
-                    trendline.break_price = close[bar]
-                    return True
-            else:
-                # Resistance broken when close is decisively above
-                if close[bar] > line_price + tolerance:
-                    trendline.break_bar = bar
-                    trendline.break_price = close[bar]
-                    return True
-        
+        end = min(current_bar + 1, len(close))
+        if end <= start_bar:
+            return False
+
+        # Evaluate the line over the whole window and find the first
+        # decisive break with one vectorized comparison
+        bars = np.arange(start_bar, end)
+        line_prices = trendline.slope * bars + trendline.intercept
+        tolerances = line_prices * self.slice_tolerance_pct
+        closes = close[start_bar:end]
+
+        if trendline.line_type == TrendlineType.SUPPORT:
+            # Support broken when close is decisively below
+            mask = closes < line_prices - tolerances
+        else:
+            # Resistance broken when close is decisively above
+            mask = closes > line_prices + tolerances
+
+        if mask.any():
+            k = int(np.argmax(mask))
+            trendline.break_bar = start_bar + k
+            trendline.break_price = float(closes[k])
+            return True
+
         return False
     
     def _grade_trendline(self, trendline: Trendline) -> StructureGrade:
@@ -646,29 +673,49 @@ class StructureDetector:
         """Remove trendlines that are nearly identical."""
         if not trendlines:
             return []
-        
-        unique = []
-        
+
+        # Same semantics as the plain pairwise scan (first kept match in
+        # insertion order wins, higher grade replaces and re-appends),
+        # but each candidate only examines kept lines whose intercept
+        # falls inside the duplicate tolerance. Kept lines live in an
+        # intercept-sorted list for the window query and in a seq-keyed
+        # dict for insertion order; seq numbers are reassigned on
+        # replacement exactly like the old remove+append did.
+        by_intercept: List[Tuple[float, int, Trendline]] = []
+        kept: Dict[int, Trendline] = {}
+        next_seq = 0
+
         for line in trendlines:
-            is_duplicate = False
-            
-            for existing in unique:
-                # Check if slopes are similar
-                slope_diff = abs(line.slope - existing.slope) / (abs(existing.slope) + 1e-10)
-                intercept_diff = abs(line.intercept - existing.intercept) / (abs(existing.intercept) + 1e-10)
-                
+            # |line.i - kept.i| < 0.01 * (|kept.i| + 1e-10) implies the
+            # kept intercept is within this radius of the new one
+            radius = (0.01 * abs(line.intercept) + 1e-12) / 0.98
+            lo = bisect_left(by_intercept, (line.intercept - radius,))
+            hi = bisect_right(by_intercept, (line.intercept + radius, float('inf')))
+
+            existing = None
+            existing_seq = -1
+            for m in range(lo, hi):
+                _, seq, candidate = by_intercept[m]
+                if existing is not None and seq > existing_seq:
+                    continue
+                slope_diff = abs(line.slope - candidate.slope) / (abs(candidate.slope) + 1e-10)
+                intercept_diff = abs(line.intercept - candidate.intercept) / (abs(candidate.intercept) + 1e-10)
                 if slope_diff < 0.1 and intercept_diff < 0.01:
-                    # Keep the higher graded one
-                    if line.grade.value > existing.grade.value:
-                        unique.remove(existing)
-                        unique.append(line)
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique.append(line)
-        
-        return unique
+                    existing, existing_seq = candidate, seq
+
+            if existing is None:
+                kept[next_seq] = line
+                insort(by_intercept, (line.intercept, next_seq, line))
+                next_seq += 1
+            elif line.grade.value > existing.grade.value:
+                # Keep the higher graded one
+                del kept[existing_seq]
+                del by_intercept[bisect_left(by_intercept, (existing.intercept, existing_seq))]
+                kept[next_seq] = line
+                insort(by_intercept, (line.intercept, next_seq, line))
+                next_seq += 1
+
+        return [kept[seq] for seq in sorted(kept)]
     
     def _detect_horizontal_levels(
         self,
@@ -704,31 +751,37 @@ class StructureDetector:
         if len(current_cluster) >= self.min_level_touches:
             clusters.append(current_cluster)
         
+        # Window shared by every level's bipolar touch count
+        start = max(0, current_bar - 200)
+        low_w = low[start:current_bar + 1]
+        high_w = high[start:current_bar + 1]
+        close_w = close[start:current_bar + 1]
+
         # Create levels from clusters
         for cluster in clusters:
             avg_price = np.mean(cluster)
-            
+
             # Determine type based on recent price action
             current_price = close[current_bar]
             if current_price > avg_price:
                 level_type = TrendlineType.SUPPORT
             else:
                 level_type = TrendlineType.RESISTANCE
-            
+
             level = HorizontalLevel(
                 price=avg_price,
                 level_type=level_type,
                 touch_count=len(cluster),
             )
-            
-            # Track bipolar touches
-            for bar in range(max(0, current_bar - 200), current_bar + 1):
-                tolerance = avg_price * self.touch_tolerance_pct
-                
-                if abs(low[bar] - avg_price) < tolerance and close[bar] > avg_price:
-                    level.support_touches += 1
-                if abs(high[bar] - avg_price) < tolerance and close[bar] < avg_price:
-                    level.resistance_touches += 1
+
+            # Track bipolar touches - one vectorized pass over the window
+            tolerance = avg_price * self.touch_tolerance_pct
+            level.support_touches = int(np.count_nonzero(
+                (np.abs(low_w - avg_price) < tolerance) & (close_w > avg_price)
+            ))
+            level.resistance_touches = int(np.count_nonzero(
+                (np.abs(high_w - avg_price) < tolerance) & (close_w < avg_price)
+            ))
             
             # Grade the level
             if level.is_bipolar() or level.touch_count >= 4:
@@ -757,25 +810,33 @@ class StructureDetector:
         2. (Optional) A horizontal level is nearby
         """
         pressure_points = []
-        
+
+        # Sort levels by price once so each trendline's confluence lookup
+        # is a bisect into the tolerance window instead of a scan over
+        # every horizontal level
+        by_price = sorted(range(len(horizontal_levels)), key=lambda k: horizontal_levels[k].price)
+        sorted_prices = [horizontal_levels[k].price for k in by_price]
+
         for trendline in trendlines:
             if not trendline.is_valid or trendline.is_broken:
                 continue
-            
+
             # Get trendline price at current bar
             line_price = trendline.get_price_at_bar(current_bar)
-            
+
             # Skip if too far from current price
             distance_pct = abs(current_price - line_price) / current_price
             if distance_pct > 0.05:  # More than 5% away
                 continue
-            
-            # Check for horizontal level confluence
+
+            # Check for horizontal level confluence: first level (in
+            # detection order) within the cluster tolerance
             confluent_level = None
-            for level in horizontal_levels:
-                if abs(level.price - line_price) / line_price < self.level_cluster_pct:
-                    confluent_level = level
-                    break
+            tol = line_price * self.level_cluster_pct
+            lo = bisect_right(sorted_prices, line_price - tol)
+            hi = bisect_left(sorted_prices, line_price + tol)
+            if lo < hi:
+                confluent_level = horizontal_levels[min(by_price[lo:hi])]
             
             # Calculate confluence score
             confluence_score = self._calculate_confluence_score(
@@ -788,8 +849,8 @@ class StructureDetector:
                 trendline=trendline,
                 horizontal_level=confluent_level,
                 confluence_score=confluence_score,
-                is_support=trendline.line_type in [TrendlineType.SUPPORT, TrendlineType.BIPOLAR],
-                is_resistance=trendline.line_type in [TrendlineType.RESISTANCE, TrendlineType.BIPOLAR],
+                is_support=trendline.line_type in _SUPPORT_SIDE,
+                is_resistance=trendline.line_type in _RESISTANCE_SIDE,
             ))
         
         # Sort by confluence score
@@ -7,15 +7,30 @@ Uses the Helsinki VM proxy for reliability.
 """
 
 import asyncio
+import time
 import aiohttp
+import orjson
 import pandas as pd
 import numpy as np
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# How long cached OHLCV stays fresh per interval (seconds). Short enough
+# that the forming candle is never badly stale, long enough to absorb
+# bursts of identical /calculate requests.
+OHLCV_CACHE_TTL = {
+    "1m": 30,
+    "5m": 60,
+    "15m": 120,
+    "1h": 180,
+    "4h": 240,
+    "1d": 300,
+}
+DEFAULT_CACHE_TTL = 60
+
 # Helsinki VM endpoints
 HELSINKI_SPOT = "http://77.42.29.188:5000"
 HELSINKI_QUANT = "http://77.42.29.188:5002"
@@ -35,6 +50,9 @@ class LiveDataFetcher:
     def __init__(self, timeout: int = 15):
         self.timeout = aiohttp.ClientTimeout(total=timeout)
         self._session: Optional[aiohttp.ClientSession] = None
+        # (symbol, interval, limit) -> (monotonic fetch time, DataFrame)
+        self._ohlcv_cache: Dict[Tuple[str, str, int], Tuple[float, pd.DataFrame]] = {}
+        self._ohlcv_locks: Dict[Tuple[str, str, int], asyncio.Lock] = {}
     
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
@@ -62,28 +80,54 @@ class LiveDataFetcher:
         Returns:
             DataFrame with columns: open, high, low, close, volume, timestamp
         """
+        key = (symbol, interval, limit)
+        ttl = OHLCV_CACHE_TTL.get(interval, DEFAULT_CACHE_TTL)
+
+        cached = self._ohlcv_cache.get(key)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+        # Per-key lock so concurrent identical requests coalesce into one fetch
+        lock = self._ohlcv_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._ohlcv_cache.get(key)
+            if cached and time.monotonic() - cached[0] < ttl:
+                return cached[1]
+
+            df = await self._fetch_ohlcv(symbol, interval, limit)
+            if not df.empty:
+                self._ohlcv_cache[key] = (time.monotonic(), df)
+            return df
+
+    async def _fetch_ohlcv(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int,
+    ) -> pd.DataFrame:
+        """Fetch OHLCV from upstream (Helsinki VM, then Binance fallback)."""
         session = await self._get_session()
-        
+
         # Try Helsinki VM first
         try:
             url = f"{HELSINKI_SPOT}/api/klines/{symbol}"
             params = {"interval": interval, "limit": limit}
-            
+
             async with session.get(url, params=params) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = orjson.loads(await resp.read())
                     return self._parse_klines(data)
         except Exception as e:
             logger.warning(f"Helsinki VM failed, falling back to Binance: {e}")
-        
+
         # Fallback to Binance
         try:
             url = f"{BINANCE_API}/api/v3/klines"
             params = {"symbol": symbol, "interval": interval, "limit": limit}
-            
+
             async with session.get(url, params=params) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = orjson.loads(await resp.read())
                     return self._parse_klines(data)
         except Exception as e:
             logger.error(f"Binance also failed: {e}")
@@ -192,22 +236,24 @@ class LiveDataFetcher:
         """Parse Binance klines format to DataFrame."""
         if not data:
             return pd.DataFrame()
-        
+
         # Binance klines: [timestamp, o, h, l, c, vol, close_time, ...]
-        df = pd.DataFrame(data, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-        
-        # Convert types
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
-        
-        df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
-        df.set_index('timestamp', inplace=True)
-        
+        # Only the first six fields are used - materialize just those into
+        # one float64 array instead of a 12-column object DataFrame
+        raw = np.asarray([k[:6] for k in data], dtype=np.float64)
+
+        df = pd.DataFrame(
+            {
+                'open': raw[:, 1],
+                'high': raw[:, 2],
+                'low': raw[:, 3],
+                'close': raw[:, 4],
+                'volume': raw[:, 5],
+            },
+            index=pd.to_datetime(raw[:, 0].astype(np.int64), unit='ms'),
+        )
+        df.index.name = 'timestamp'
+
         return df
 
 
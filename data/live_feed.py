@@ -202,7 +202,26 @@ class LiveFeed:
             self._bar_cache[symbol] = {}
         
         logger.info(f"Subscribed to {symbol} (timeframes: {sub.timeframes})")
-    
+
+    async def subscribe_many(self, requests: List[tuple]):
+        """
+        Subscribe to several (symbol, timeframes) pairs in one call.
+
+        Registration is in-memory (the feed polls HTTP rather than sending
+        per-subscription frames), so batching a burst of subscriptions -
+        e.g. auto-updater startup fan-out - costs one call and one log
+        line instead of N.
+        """
+        for symbol, timeframes in requests:
+            if symbol not in self._subscriptions:
+                self._subscriptions[symbol] = Subscription(symbol=symbol)
+            if timeframes:
+                self._subscriptions[symbol].timeframes.update(timeframes)
+            if symbol not in self._bar_cache:
+                self._bar_cache[symbol] = {}
+
+        logger.info("Subscribed to %d symbols (batched)", len(requests))
+
     async def unsubscribe(self, symbol: str):
         """Unsubscribe from a symbol."""
         if symbol in self._subscriptions:
@@ -710,12 +729,11 @@ class SessionAutoUpdater:
         self.feed.on_price_update(self._on_price_update)
         self.feed.on_bar_close(self._on_bar_close)
         
-        # Subscribe to symbols from active sessions
-        for session in self.session_manager.get_active_sessions():
-            await self.feed.subscribe(
-                session.symbol,
-                timeframes=[session.timeframe],
-            )
+        # Subscribe to symbols from active sessions in one batched call
+        await self.feed.subscribe_many([
+            (session.symbol, [session.timeframe])
+            for session in self.session_manager.get_active_sessions()
+        ])
         
         logger.info("Session auto-updater started")
     
@@ -726,15 +744,16 @@ class SessionAutoUpdater:
         for session in sessions:
             # Just update current price for P&L tracking
             # Full update happens on bar close
+            session.mark_dirty()
             session.current_price = update.price
-            
+
             # Recalculate unrealized P&L
             if session.remaining_size > 0:
                 if session.direction == "long":
                     session.unrealized_pnl = (update.price - session.average_entry) * session.remaining_size
                 else:
                     session.unrealized_pnl = (session.average_entry - update.price) * session.remaining_size
-                
+
                 session.unrealized_pnl_pct = (session.unrealized_pnl / session.account_balance) * 100
     
     async def _on_bar_close(self, update: BarUpdate):
@@ -753,8 +772,10 @@ class SessionAutoUpdater:
             
             # Get recent swing data for guarding line
             bars = await self.feed.get_bars(update.symbol, update.timeframe, limit=20)
-            recent_lows = bars['low'].tolist() if not bars.empty else None
-            recent_highs = bars['high'].tolist() if not bars.empty else None
+            # Pass the numpy views straight through - update_session accepts
+            # arrays, so no per-bar list copies
+            recent_lows = bars['low'].to_numpy() if not bars.empty else None
+            recent_highs = bars['high'].to_numpy() if not bars.empty else None
             
             # Update session
             result = self.session_manager.update_session(
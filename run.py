@@ -49,7 +49,11 @@ if __name__ == "__main__":
         "api.server:app",
         host=host,
         port=port,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
+        # Sessions, response caches, and the feed poller are per-process;
+        # raise API_WORKERS above 1 only with externalized session state
+        workers=int(os.getenv("API_WORKERS", "1")),
         log_level="info"
     )
 
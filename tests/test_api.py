@@ -480,6 +480,99 @@ class TestSessionManager:
         assert update.exit_percentage == 33
 
 
+class TestSessionFeedSync:
+    """Live feed ticks must invalidate cached session payloads."""
+
+    def test_get_after_tick_reflects_new_price(self, client):
+        """GET after a simulated price tick returns the tick price and P&L."""
+        import asyncio
+        from datetime import datetime
+        from data.live_feed import PriceUpdate
+
+        response = client.post("/session/create", json={
+            "symbol": "BTCUSDT",
+            "direction": "long",
+            "timeframe": "4h",
+            "account_balance": 100000,
+            "structural_support": 93200,
+            "entry_price": 94500,
+        })
+        assert response.status_code == 200
+        session_id = response.json()["id"]
+
+        # Warm the memoized to_dict and the GET response cache
+        before = client.get(f"/session/{session_id}").json()
+        assert before["position"]["current_price"] != 99999.0
+
+        # Simulate a live tick through the auto-updater
+        updater = client.app.state.session_updater
+        asyncio.run(updater._on_price_update(PriceUpdate(
+            symbol="BTCUSDT",
+            price=99999.0,
+            timestamp=datetime.utcnow(),
+        )))
+
+        after = client.get(f"/session/{session_id}").json()
+        assert after["position"]["current_price"] == 99999.0
+        assert after["pnl"]["unrealized"] > 0
+
+        state = client.get(f"/session/{session_id}/state").json()
+        assert state["position"]["current_price"] == 99999.0
+
+
+class TestTrendlineDeduplication:
+    """The windowed dedup must match the plain pairwise scan exactly."""
+
+    def test_dedup_matches_pairwise_reference(self):
+        """Same survivors, same order, same grade replacements."""
+        import numpy as np
+        from core.structure_detector import (
+            StructureDetector, Trendline, SwingPoint, TrendlineType, StructureGrade,
+        )
+
+        def pairwise_reference(trendlines):
+            unique = []
+            for line in trendlines:
+                is_duplicate = False
+                for existing in unique:
+                    slope_diff = abs(line.slope - existing.slope) / (abs(existing.slope) + 1e-10)
+                    intercept_diff = abs(line.intercept - existing.intercept) / (abs(existing.intercept) + 1e-10)
+                    if slope_diff < 0.1 and intercept_diff < 0.01:
+                        if line.grade.value > existing.grade.value:
+                            unique.remove(existing)
+                            unique.append(line)
+                        is_duplicate = True
+                        break
+                if not is_duplicate:
+                    unique.append(line)
+            return unique
+
+        detector = StructureDetector()
+        anchor = SwingPoint(index=0, price=100.0, swing_type="low", strength=0.5)
+        secondary = SwingPoint(index=10, price=105.0, swing_type="low", strength=0.5)
+        rng = np.random.default_rng(42)
+
+        for _ in range(50):
+            n = int(rng.integers(1, 80))
+            base_intercepts = rng.uniform(50, 150, size=max(1, n // 8))
+            base_slopes = rng.uniform(-2, 2, size=max(1, n // 8))
+            lines = []
+            for _ in range(n):
+                intercept = float(base_intercepts[rng.integers(0, len(base_intercepts))] * (1 + rng.normal(0, 0.008)))
+                slope = float(base_slopes[rng.integers(0, len(base_slopes))] * (1 + rng.normal(0, 0.08)))
+                line = Trendline(
+                    anchor_point=anchor, secondary_point=secondary,
+                    line_type=TrendlineType.SUPPORT,
+                    slope=slope, intercept=intercept, touch_count=2,
+                )
+                line.grade = StructureGrade(int(rng.integers(0, 5)))
+                lines.append(line)
+
+            expected = pairwise_reference(lines)
+            result = detector._deduplicate_trendlines(lines)
+            assert [id(t) for t in result] == [id(t) for t in expected]
+
+
 class TestDetectionSystems:
     """Tests for detection system imports."""
     